@@ -40,32 +40,32 @@ def main():
     )
     
     print("📦 Learning Package Created!")
-    print(f"   Topic: {package['topic']}")
-    print(f"   Difficulty: {package['difficulty']}")
-    print(f"   Quiz Questions: {len(package['quiz'])}")
+    print(f"   Topic: {package.topic}")
+    print(f"   Difficulty: {package.difficulty}")
+    print(f"   Quiz Questions: {len(package.quiz)}")
     print()
     
     # Display research summary
     print("-" * 70)
     print("RESEARCH SUMMARY")
     print("-" * 70)
-    print(package['research']['structured_summary'][:500] + "...")
+    print(package.research['structured_summary'][:500] + "...")
     print()
     
     # Display learning plan preview
     print("-" * 70)
     print("LEARNING PLAN (Preview)")
     print("-" * 70)
-    print(package['learning_plan'][:500] + "...")
+    print(package.learning_plan[:500] + "...")
     print()
     
     # Display quiz questions
     print("-" * 70)
     print("QUIZ QUESTIONS")
     print("-" * 70)
-    for i, question in enumerate(package['quiz'], 1):
-        print(f"\nQ{i}: {question['question']}")
-        for key, value in question['options'].items():
+    for i, question in enumerate(package.quiz, 1):
+        print(f"\nQ{i}: {question.question}")
+        for key, value in question.options.items():
             print(f"   {key}) {value}")
     print()
     
@@ -77,15 +77,13 @@ def main():
     
     # Simulate user answers (for demo, we'll answer all correctly)
     print("Simulating user answers (all correct for demo)...")
-    user_answers = {
-        i: q['correct'] for i, q in enumerate(package['quiz'])
-    }
+    user_answers = [q.correct for q in package.quiz]
     print(f"User answers: {user_answers}")
     print()
     
     # Evaluate the quiz
     results = orchestrator.evaluate_quiz(
-        quiz_questions=package['quiz'],
+        quiz_questions=package.quiz,
         user_answers=user_answers,
         topic=topic,
         user_id=user_id
@@ -135,7 +133,7 @@ def main():
     if dashboard['recent_scores']:
         print("   Recent Quiz Scores:")
         for score in dashboard['recent_scores']:
-            print(f"      - {score['topic']}: {score['score']}/{score['total']} ({score['percentage']:.0f}%)")
+            print(f"      - {score['topic']}: {score['score']}/{score['total']} ({score['percentage']:.0f}%) on {score['date']}")
     print()
     
     print("=" * 70)
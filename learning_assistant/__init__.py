@@ -1,3 +1,3 @@
-from learning_assistant.orchestrator import LearningOrchestrator
+from learning_assistant.orchestrator import LearningOrchestrator, get_orchestrator
 
-__all__ = ["LearningOrchestrator"]
+__all__ = ["LearningOrchestrator", "get_orchestrator"]
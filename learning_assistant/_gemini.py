@@ -0,0 +1,272 @@
+"""Shared Gemini model used by all agents."""
+
+import asyncio
+import datetime
+import functools
+import json
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+from learning_assistant.cache import ResponseCache
+from learning_assistant.config import config
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+
+# Context-cached models: (model name, instructions) -> (model or None, refresh time)
+_context_caches: Dict[Tuple[str, str], Tuple[Optional["genai.GenerativeModel"], float]] = {}
+
+# Instructions vary per topic once research is included, so bound the table
+_MAX_CONTEXT_CACHES = 64
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """Stand-in for a Gemini response served from the response cache."""
+    text: str
+
+
+def _genai():
+    """
+    Import the Gemini SDK on first use.
+    
+    google.generativeai pulls in grpc, protobuf and google-auth, so it is
+    only imported once a model is actually needed.
+    """
+    import google.generativeai as genai
+    return genai
+
+
+def get_model(api_key: str = None, system_instruction: Optional[str] = None) -> "genai.GenerativeModel":
+    """
+    Get a shared, configured Gemini model.
+    
+    The API key is configured once per process and models are memoised
+    per system instruction, so every agent reuses the same client and an
+    instruction is attached to its model once instead of being prepended
+    to every prompt.
+    
+    Args:
+        api_key: Google Gemini API key (optional, uses config if not provided)
+        system_instruction: Stable instructions for the model (optional)
+        
+    Returns:
+        The configured GenerativeModel for config.MODEL_NAME
+    """
+    _configure(api_key or config.GEMINI_API_KEY)
+    return _build_model(config.MODEL_NAME, system_instruction)
+
+
+@functools.lru_cache(maxsize=1)
+def _configure(api_key: str):
+    """Configure the Gemini SDK (memoised)."""
+    _genai().configure(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_model(model_name: str, system_instruction: Optional[str]) -> "genai.GenerativeModel":
+    """Build a model with a system instruction (memoised)."""
+    return _genai().GenerativeModel(model_name, system_instruction=system_instruction)
+
+
+def get_cached_model(instructions: str) -> Optional["genai.GenerativeModel"]:
+    """
+    Get a model whose context cache already holds the given instructions.
+    
+    The cache is created on first use and recreated shortly before its TTL
+    expires. If it cannot be created (for example because the instructions
+    are shorter than the model's minimum cacheable size), None is returned
+    and creation is not retried until the TTL has passed.
+    
+    Args:
+        instructions: Stable prompt instructions to cache
+        
+    Returns:
+        A GenerativeModel bound to the cached content, or None
+    """
+    key = (config.MODEL_NAME, instructions)
+    entry = _context_caches.get(key)
+    if entry is not None and time.monotonic() < entry[1]:
+        return entry[0]
+    
+    genai = _genai()
+    ttl = config.CONTEXT_CACHE_TTL
+    try:
+        cached_content = genai.caching.CachedContent.create(
+            model=config.MODEL_NAME,
+            contents=[instructions],
+            ttl=datetime.timedelta(seconds=ttl)
+        )
+        model = genai.GenerativeModel.from_cached_content(cached_content)
+    except Exception:
+        model = None
+    
+    # Refresh a minute early so requests never reference an expired cache
+    _context_caches.pop(key, None)
+    _context_caches[key] = (model, time.monotonic() + max(ttl - 60, 0))
+    while len(_context_caches) > _MAX_CONTEXT_CACHES:
+        del _context_caches[next(iter(_context_caches))]
+    return model
+
+
+@functools.lru_cache(maxsize=1)
+def _retry_predicate():
+    """Match transient failures: rate limiting (429) and server errors (5xx)."""
+    from google.api_core import exceptions as api_exceptions
+    from google.api_core import retry as api_retry
+    
+    return api_retry.if_exception_type(
+        api_exceptions.ResourceExhausted,
+        api_exceptions.InternalServerError,
+        api_exceptions.BadGateway,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.GatewayTimeout,
+        api_exceptions.DeadlineExceeded
+    )
+
+
+def request_options(asynchronous: bool = False) -> Dict:
+    """
+    Build the request options shared by all Gemini calls.
+    
+    Transient errors are retried with exponential backoff, bounded by
+    config.RETRY_TIMEOUT in total.
+    
+    Args:
+        asynchronous: Whether the options are for an async call
+        
+    Returns:
+        Request options for generate_content / generate_content_async
+    """
+    from google.api_core import retry as api_retry
+    from google.api_core import retry_async
+    
+    retry_class = retry_async.AsyncRetry if asynchronous else api_retry.Retry
+    return {
+        "retry": retry_class(
+            predicate=_retry_predicate(),
+            initial=config.RETRY_INITIAL_DELAY,
+            maximum=config.RETRY_MAX_DELAY,
+            multiplier=2.0,
+            timeout=config.RETRY_TIMEOUT
+        )
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _response_cache(path: str, ttl: float) -> ResponseCache:
+    """Open the response cache (memoised)."""
+    return ResponseCache(path, ttl)
+
+
+def _response_cache_key(instructions: str, request: str, kwargs: Dict) -> Optional[str]:
+    """
+    Get the response cache key for a call, or None if it must not be cached.
+    
+    Streamed calls are never cached. The generation config is part of the
+    key because it changes the format of the response.
+    """
+    if not config.USE_RESPONSE_CACHE or kwargs.get("stream"):
+        return None
+    
+    generation_config = json.dumps(kwargs.get("generation_config"), default=str, sort_keys=True)
+    prompt = f"{generation_config}\n{instructions}\n\n{request}"
+    return ResponseCache.key("gemini", config.MODEL_NAME, prompt)
+
+
+def _cached_response(key: Optional[str]) -> Optional[CachedResponse]:
+    """Look up a response in the response cache."""
+    if key is None:
+        return None
+    text = _response_cache(config.RESPONSE_CACHE_PATH, config.RESPONSE_CACHE_TTL).get(key)
+    return CachedResponse(text) if text is not None else None
+
+
+def _store_response(key: Optional[str], response, validate: Optional[Callable[[str], bool]]):
+    """Store a response's text in the response cache, if it passes validate."""
+    if key is not None and (validate is None or validate(response.text)):
+        _response_cache(config.RESPONSE_CACHE_PATH, config.RESPONSE_CACHE_TTL).set(key, response.text)
+
+
+def generate(model: "genai.GenerativeModel", instructions: str, request: str,
+             cache: bool = True, validate: Optional[Callable[[str], bool]] = None, **kwargs):
+    """
+    Generate content for a prompt made of stable instructions and a request.
+    
+    Identical non-streamed calls are answered from the response cache
+    while config.USE_RESPONSE_CACHE is enabled, unless cache is False; a
+    validate callback keeps responses the caller cannot use out of it.
+    Only the request is sent: to the context-cached model when config.USE_CONTEXT_CACHE is enabled
+    and the instructions are cached, otherwise to the given model, which
+    carries the instructions as its system instruction. Transient API
+    errors are retried (see request_options).
+    
+    Args:
+        model: Model from get_model(system_instruction=instructions), used
+            when no context cache is available
+        instructions: Stable prompt instructions
+        request: Per-call part of the prompt
+        cache: Use the response cache; pass False for calls that must
+            produce a fresh response each time
+        validate: Called with the response text; the response is only
+            cached if it returns True (optional, everything is cached)
+        **kwargs: Extra arguments for generate_content
+        
+    Returns:
+        The Gemini response (or a CachedResponse)
+    """
+    key = _response_cache_key(instructions, request, kwargs) if cache else None
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+    
+    kwargs.setdefault("request_options", request_options())
+    
+    cached_model = get_cached_model(instructions) if config.USE_CONTEXT_CACHE else None
+    if cached_model is not None:
+        response = cached_model.generate_content(request, **kwargs)
+    else:
+        response = model.generate_content(request, **kwargs)
+    
+    _store_response(key, response, validate)
+    return response
+
+
+async def generate_async(model: "genai.GenerativeModel", instructions: str, request: str,
+                         cache: bool = True, validate: Optional[Callable[[str], bool]] = None,
+                         **kwargs):
+    """
+    Asynchronous variant of generate.
+    
+    Args:
+        model: Model from get_model(system_instruction=instructions), used
+            when no context cache is available
+        instructions: Stable prompt instructions
+        request: Per-call part of the prompt
+        cache: Use the response cache (see generate)
+        validate: Only cache responses whose text it accepts (see generate)
+        **kwargs: Extra arguments for generate_content_async
+        
+    Returns:
+        The Gemini response (or a CachedResponse)
+    """
+    key = _response_cache_key(instructions, request, kwargs) if cache else None
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+    
+    kwargs.setdefault("request_options", request_options(asynchronous=True))
+    
+    cached_model = None
+    if config.USE_CONTEXT_CACHE:
+        # Creating the cache is a blocking request, keep it off the event loop
+        cached_model = await asyncio.to_thread(get_cached_model, instructions)
+    if cached_model is not None:
+        response = await cached_model.generate_content_async(request, **kwargs)
+    else:
+        response = await model.generate_content_async(request, **kwargs)
+    
+    _store_response(key, response, validate)
+    return response
@@ -0,0 +1,42 @@
+"""JSON (de)serialisation for data files, using orjson when it is installed."""
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+    import json
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document.
+    
+    Args:
+        data: JSON text, as bytes or str
+        
+    Returns:
+        The decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """
+    Serialise a value to UTF-8 encoded JSON.
+    
+    Args:
+        value: JSON-serialisable value
+        indent: Pretty-print with two-space indentation
+        
+    Returns:
+        The JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,150 @@
+"""Asynchronous Wikipedia client backed by the MediaWiki API."""
+
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+API_URL = "https://en.wikipedia.org/w/api.php"
+
+# Wikimedia asks API clients to identify themselves
+USER_AGENT = "Personalised-Learning-Assistant (https://github.com/Gabrielaholzel/Personalised-Learning-Assistant)"
+
+# One pooled session per event loop (sessions cannot be shared across loops).
+# Weakly keyed, but a session refers to its loop, so sessions of closed loops
+# are also dropped explicitly whenever a new one is created.
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+class PageError(Exception):
+    """Raised when no Wikipedia page matches the requested title."""
+    
+    def __init__(self, title: str):
+        super().__init__(f"Page id \"{title}\" does not match any pages. Try another id!")
+        self.title = title
+
+
+class DisambiguationError(Exception):
+    """Raised when the requested title resolves to a disambiguation page."""
+    
+    def __init__(self, title: str, options: List[str]):
+        super().__init__(f"\"{title}\" may refer to: " + ", ".join(options))
+        self.title = title
+        self.options = options
+
+
+def _session() -> "aiohttp.ClientSession":
+    """
+    Get the shared HTTP session for the running event loop.
+    
+    The session keeps connections and DNS lookups alive between calls,
+    so consecutive lookups skip the TCP and TLS handshakes.
+    """
+    import aiohttp
+    
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        for stale in [other for other in _sessions if other.is_closed()]:
+            del _sessions[stale]
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"User-Agent": USER_AGENT}
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close():
+    """Close the shared session of the running event loop, if any."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def _query(params: Dict[str, str]) -> Dict:
+    """Run a MediaWiki query and return its "query" section."""
+    params = {"action": "query", "format": "json", "formatversion": "2", **params}
+    async with _session().get(API_URL, params=params) as response:
+        response.raise_for_status()
+        data = await response.json()
+    return data.get("query", {})
+
+
+async def summary(title: str, sentences: int = 0) -> str:
+    """
+    Get the plain-text summary of a Wikipedia page.
+    
+    Redirects are followed and, if no page has the exact title, the first
+    search result is used instead, mirroring wikipedia.summary.
+    
+    Args:
+        title: Title of the page
+        sentences: Number of sentences to return (the intro section if 0)
+        
+    Returns:
+        The page summary
+        
+    Raises:
+        PageError: If neither the title nor a search for it finds a page
+        DisambiguationError: If the title is ambiguous
+    """
+    params = {
+        "prop": "extracts|pageprops",
+        "ppprop": "disambiguation",
+        "explaintext": "1",
+        "redirects": "1"
+    }
+    if sentences:
+        params["exsentences"] = str(sentences)
+    else:
+        params["exintro"] = "1"
+    
+    page = await _page(params, title)
+    if page is None:
+        suggestion = await _search(title)
+        if suggestion is not None and suggestion != title:
+            page = await _page(params, suggestion)
+        if page is None:
+            raise PageError(title)
+    
+    if "disambiguation" in page.get("pageprops", {}):
+        raise DisambiguationError(page["title"], await _links(page["title"]))
+    
+    return page.get("extract", "")
+
+
+async def _page(params: Dict[str, str], title: str) -> Optional[Dict]:
+    """Look up a page by title, returning None if it does not exist."""
+    pages = (await _query({**params, "titles": title})).get("pages", [])
+    page = pages[0] if pages else {"missing": True}
+    if page.get("missing") or page.get("invalid"):
+        return None
+    return page
+
+
+async def _search(query: str) -> Optional[str]:
+    """Get the title of the first full-text search result for a query, if any."""
+    results = (await _query({
+        "list": "search",
+        "srsearch": query,
+        "srlimit": "1",
+        "srprop": ""
+    })).get("search", [])
+    return results[0]["title"] if results else None
+
+
+async def _links(title: str) -> List[str]:
+    """Get the article titles a page links to (used for disambiguation options)."""
+    query = await _query({
+        "prop": "links",
+        "plnamespace": "0",
+        "pllimit": "max",
+        "titles": title
+    })
+    pages = query.get("pages", [])
+    return [link["title"] for link in pages[0].get("links", [])] if pages else []
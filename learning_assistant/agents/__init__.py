@@ -1,7 +1,17 @@
-from learning_assistant.agents.research_agent import ResearchAgent
-from learning_assistant.agents.content_agent import ContentAgent
-from learning_assistant.agents.quiz_agent import QuizAgent
-from learning_assistant.agents.personalisation_engine import PersonalisationEngine
+"""Agents of the Personalised Learning Assistant.
+
+Agents are imported on first access (PEP 562), so importing this package
+does not load the Gemini SDK or the Wikipedia client until they are used.
+"""
+
+import importlib
+
+_AGENT_MODULES = {
+    "ResearchAgent": "learning_assistant.agents.research_agent",
+    "ContentAgent": "learning_assistant.agents.content_agent",
+    "QuizAgent": "learning_assistant.agents.quiz_agent",
+    "PersonalisationEngine": "learning_assistant.agents.personalisation_engine"
+}
 
 __all__ = [
     "ResearchAgent",
@@ -9,3 +19,16 @@ __all__ = [
     "QuizAgent",
     "PersonalisationEngine"
 ]
+
+
+def __getattr__(name):
+    if name not in _AGENT_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(_AGENT_MODULES[name]), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
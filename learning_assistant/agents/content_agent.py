@@ -1,8 +1,32 @@
 """Content Agent - Generates personalised learning plans and lessons."""
 
-import google.generativeai as genai
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from typing_extensions import TypedDict
 
+from learning_assistant._gemini import get_model, generate, generate_async
 from learning_assistant.config import config
+from learning_assistant.prompts import (
+    LEARNING_PLAN_INSTRUCTIONS,
+    LESSON_INSTRUCTIONS,
+    LESSONS_BATCH_INSTRUCTIONS,
+    LESSON_DOSSIER_TEMPLATE
+)
+
+
+class LessonSchema(TypedDict):
+    """Schema of one lesson in a batched lesson response."""
+    module: str
+    lesson: str
+
+
+# Ask Gemini for structured output when generating several lessons at once
+LESSONS_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": list[LessonSchema]
+}
 
 
 class ContentAgent:
@@ -18,9 +42,8 @@ class ContentAgent:
         Args:
             api_key: Google Gemini API key (optional, uses config if not provided)
         """
-        api_key = api_key or config.GEMINI_API_KEY
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(config.MODEL_NAME)
+        self.api_key = api_key
+        self.plan_model = get_model(api_key, LEARNING_PLAN_INSTRUCTIONS)
     
     def generate_learning_plan(self, topic: str, goal: str, 
                               difficulty: str = "beginner") -> str:
@@ -35,75 +58,348 @@ class ContentAgent:
         Returns:
             Structured learning plan as a string
         """
-        # Adapt prompt based on difficulty
-        difficulty_context = {
-            "beginner": "Focus on fundamentals and basic concepts. Use simple language and provide plenty of examples.",
-            "intermediate": "Build on foundational knowledge. Include more technical details and practical applications.",
-            "advanced": "Assume strong foundational knowledge. Focus on advanced concepts, edge cases, and expert-level insights."
-        }
+        response = generate(
+            self.plan_model,
+            LEARNING_PLAN_INSTRUCTIONS,
+            self._learning_plan_request(topic, goal, difficulty)
+        )
+        return response.text
+    
+    async def generate_learning_plan_async(self, topic: str, goal: str,
+                                           difficulty: str = "beginner") -> str:
+        """
+        Asynchronous variant of generate_learning_plan.
         
-        context = difficulty_context.get(difficulty, difficulty_context["beginner"])
+        Args:
+            topic: The subject to create a plan for
+            goal: User's learning objective
+            difficulty: Current difficulty level (beginner/intermediate/advanced)
+            
+        Returns:
+            Structured learning plan as a string
+        """
+        response = await generate_async(
+            self.plan_model,
+            LEARNING_PLAN_INSTRUCTIONS,
+            self._learning_plan_request(topic, goal, difficulty)
+        )
+        return response.text
+    
+    async def stream_learning_plan(self, topic: str, goal: str,
+                                   difficulty: str = "beginner") -> AsyncIterator[str]:
+        """
+        Generate a learning plan, yielding its text as it is produced.
         
-        prompt = f"""Create a detailed learning plan for: {topic}
-
+        Args:
+            topic: The subject to create a plan for
+            goal: User's learning objective
+            difficulty: Current difficulty level (beginner/intermediate/advanced)
+            
+        Yields:
+            Consecutive pieces of the learning plan text
+        """
+        stream = await generate_async(
+            self.plan_model,
+            LEARNING_PLAN_INSTRUCTIONS,
+            self._learning_plan_request(topic, goal, difficulty),
+            stream=True
+        )
+        async for chunk in stream:
+            yield chunk.text
+    
+    def _learning_plan_request(self, topic: str, goal: str, difficulty: str) -> str:
+        """Build the per-call part of the learning plan prompt."""
+        return f"""Topic: {topic}
 Learning Goal: {goal}
-Difficulty Level: {difficulty}
-
-{context}
-
-Structure the plan as:
-1. Learning Objectives (3-5 specific, measurable goals)
-2. Prerequisites (if any - what should learners know before starting)
-3. Learning Path (5-7 modules with brief descriptions)
-   - Each module should build on the previous one
-   - Include estimated time for each module
-4. Estimated Total Time
-5. Resources & Next Steps
-
-Make it practical, engaging, and tailored to the {difficulty} level."""
-        
-        response = self.model.generate_content(prompt)
-        return response.text
+Difficulty Level: {difficulty}"""
     
     def generate_lesson(self, topic: str, module_name: str, 
-                       difficulty: str = "beginner") -> str:
+                       difficulty: str = "beginner",
+                       research: Optional[Dict[str, str]] = None) -> str:
         """
         Generate detailed lesson content for a specific module.
         
+        When research on the topic is given, its summary is added to the
+        stable part of the prompt together with the topic and difficulty,
+        so all lessons of a topic share one cacheable prefix and only the
+        module name varies.
+        
         Args:
             topic: The overall topic
             module_name: Specific module to create lesson for
             difficulty: Current difficulty level
+            research: Research result from the Research Agent (optional)
             
         Returns:
             Detailed lesson content as a string
         """
-        difficulty_context = {
-            "beginner": "Use simple language, provide step-by-step explanations, and include basic examples.",
-            "intermediate": "Include technical details, practical applications, and real-world scenarios.",
-            "advanced": "Focus on complex concepts, advanced techniques, and expert-level insights."
+        instructions, request = self._lesson_prompt(topic, [module_name], difficulty, research)
+        response = generate(get_model(self.api_key, instructions), instructions, request)
+        return response.text
+    
+    async def generate_lesson_async(self, topic: str, module_name: str,
+                                    difficulty: str = "beginner",
+                                    research: Optional[Dict[str, str]] = None) -> str:
+        """
+        Asynchronous variant of generate_lesson.
+        
+        Args:
+            topic: The overall topic
+            module_name: Specific module to create lesson for
+            difficulty: Current difficulty level
+            research: Research result from the Research Agent (optional)
+            
+        Returns:
+            Detailed lesson content as a string
+        """
+        instructions, request = self._lesson_prompt(topic, [module_name], difficulty, research)
+        response = await generate_async(get_model(self.api_key, instructions), instructions, request)
+        return response.text
+    
+    async def stream_lesson(self, topic: str, module_name: str,
+                            difficulty: str = "beginner",
+                            research: Optional[Dict[str, str]] = None) -> AsyncIterator[str]:
+        """
+        Generate a lesson, yielding its text as it is produced.
+        
+        Args:
+            topic: The overall topic
+            module_name: Specific module to create lesson for
+            difficulty: Current difficulty level
+            research: Research result from the Research Agent (optional)
+            
+        Yields:
+            Consecutive pieces of the lesson text
+        """
+        instructions, request = self._lesson_prompt(topic, [module_name], difficulty, research)
+        stream = await generate_async(
+            get_model(self.api_key, instructions), instructions, request, stream=True
+        )
+        async for chunk in stream:
+            yield chunk.text
+    
+    def generate_lessons(self, topic: str, modules: List[str],
+                         difficulty: str = "beginner",
+                         research: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Generate lessons for several modules with as few requests as possible.
+        
+        Modules are sent in batches of config.LESSON_BATCH_SIZE, each batch
+        answered by one request returning all of its lessons as JSON, and
+        the batches run concurrently. Lessons missing from a batch
+        response are generated one by one.
+        
+        Args:
+            topic: The overall topic
+            modules: Names of the modules to create lessons for
+            difficulty: Current difficulty level
+            research: Research result from the Research Agent (optional)
+            
+        Returns:
+            Dictionary mapping each module name to its lesson, in module order
+        """
+        batches = self._lesson_batches(modules)
+        if not batches:
+            return {}
+        
+        # Blocking calls in threads: the SDK's async client is bound to one event loop
+        with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+            results = list(pool.map(
+                lambda batch: self._generate_lesson_batch(topic, batch, difficulty, research),
+                batches
+            ))
+        
+        lessons = {}
+        for batch_lessons in results:
+            lessons.update(batch_lessons)
+        return lessons
+    
+    async def generate_lessons_async(self, topic: str, modules: List[str],
+                                     difficulty: str = "beginner",
+                                     research: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Asynchronous variant of generate_lessons.
+        
+        Args:
+            topic: The overall topic
+            modules: Names of the modules to create lessons for
+            difficulty: Current difficulty level
+            research: Research result from the Research Agent (optional)
+            
+        Returns:
+            Dictionary mapping each module name to its lesson, in module order
+        """
+        results = await asyncio.gather(*(
+            self._generate_lesson_batch_async(topic, batch, difficulty, research)
+            for batch in self._lesson_batches(modules)
+        ))
+        
+        lessons = {}
+        for batch_lessons in results:
+            lessons.update(batch_lessons)
+        return lessons
+    
+    def _lesson_batches(self, modules: List[str]) -> List[List[str]]:
+        """Split modules into batches of config.LESSON_BATCH_SIZE."""
+        size = max(config.LESSON_BATCH_SIZE, 1)
+        return [modules[i:i + size] for i in range(0, len(modules), size)]
+    
+    def _generate_lesson_batch(self, topic: str, modules: List[str], difficulty: str,
+                               research: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """
+        Generate the lessons of one batch of modules (blocking).
+        
+        Args:
+            topic: The overall topic
+            modules: Names of the modules in the batch
+            difficulty: Current difficulty level
+            research: Research result from the Research Agent (optional)
+            
+        Returns:
+            Dictionary mapping each module name to its lesson
+        """
+        lessons = {}
+        if len(modules) > 1:
+            instructions, request = self._lesson_prompt(topic, modules, difficulty, research)
+            try:
+                response = generate(
+                    get_model(self.api_key, instructions), instructions, request,
+                    **self._batch_options(modules)
+                )
+                lessons = self._parse_lessons(response.text, modules)
+            except ValueError:
+                pass  # Response without text (e.g. blocked), fall back to single lessons
+        
+        missing = self._missing_lessons(lessons, modules)
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                texts = list(pool.map(
+                    lambda module: self.generate_lesson(topic, module, difficulty, research),
+                    missing
+                ))
+            lessons.update(zip(missing, texts))
+        
+        return {module: lessons[module] for module in modules}
+    
+    async def _generate_lesson_batch_async(self, topic: str, modules: List[str], difficulty: str,
+                                           research: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """
+        Generate the lessons of one batch of modules.
+        
+        Args:
+            topic: The overall topic
+            modules: Names of the modules in the batch
+            difficulty: Current difficulty level
+            research: Research result from the Research Agent (optional)
+            
+        Returns:
+            Dictionary mapping each module name to its lesson
+        """
+        lessons = {}
+        if len(modules) > 1:
+            instructions, request = self._lesson_prompt(topic, modules, difficulty, research)
+            try:
+                response = await generate_async(
+                    get_model(self.api_key, instructions), instructions, request,
+                    **self._batch_options(modules)
+                )
+                lessons = self._parse_lessons(response.text, modules)
+            except ValueError:
+                pass  # Response without text (e.g. blocked), fall back to single lessons
+        
+        missing = self._missing_lessons(lessons, modules)
+        if missing:
+            texts = await asyncio.gather(*(
+                self.generate_lesson_async(topic, module, difficulty, research)
+                for module in missing
+            ))
+            lessons.update(zip(missing, texts))
+        
+        return {module: lessons[module] for module in modules}
+    
+    def _batch_options(self, modules: List[str]) -> Dict:
+        """
+        Build the generate arguments of a batched lesson request.
+        
+        Only responses with a lesson for every module are stored in the
+        response cache, so a short or malformed batch is requested again
+        next time instead of forcing the per-lesson fallback for the
+        cache's whole TTL.
+        """
+        return {
+            "generation_config": LESSONS_GENERATION_CONFIG,
+            "validate": lambda text: not self._missing_lessons(self._parse_lessons(text, modules), modules)
         }
+    
+    def _missing_lessons(self, lessons: Dict[str, str], modules: List[str]) -> List[str]:
+        """Get the modules of a batch without a (non-empty) lesson, in order."""
+        return [module for module in modules if not lessons.get(module)]
+    
+    def _parse_lessons(self, lessons_text: str, modules: List[str]) -> Dict[str, str]:
+        """
+        Parse a batched lesson response.
         
-        context = difficulty_context.get(difficulty, difficulty_context["beginner"])
+        Lessons are matched to modules by position when the response has
+        one entry per module, otherwise by module name.
         
-        prompt = f"""Create a comprehensive lesson on: {module_name} (part of {topic})
-
-Difficulty: {difficulty}
-
-{context}
-
-Include:
-1. Introduction & Context (why this module matters)
-2. Core Concepts (with clear explanations)
-   - Break down complex ideas into digestible parts
-   - Use analogies where helpful
-3. Examples (2-3 practical examples)
-   - Show real-world applications
-   - Include step-by-step walkthroughs
-4. Key Takeaways (3-5 main points to remember)
-5. Practice Suggestions (how to apply this knowledge)
-
-Make it engaging, educational, and appropriate for {difficulty} level learners."""
+        Args:
+            lessons_text: JSON array of objects matching LessonSchema
+            modules: Names of the modules that were requested, in order
+            
+        Returns:
+            Dictionary mapping module names to lessons (possibly incomplete,
+            and empty if the response is malformed)
+        """
+        try:
+            entries = json.loads(lessons_text)
+            if len(entries) == len(modules):
+                return {module: entry["lesson"] for module, entry in zip(modules, entries)}
+            
+            by_name = {entry["module"].strip().lower(): entry["lesson"] for entry in entries}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return {}
         
-        response = self.model.generate_content(prompt)
-        return response.text
+        return {
+            module: by_name[module.strip().lower()]
+            for module in modules if module.strip().lower() in by_name
+        }
+    
+    def _lesson_prompt(self, topic: str, modules: List[str], difficulty: str,
+                       research: Optional[Dict[str, str]]) -> Tuple[str, str]:
+        """
+        Build the instructions and request of a lesson prompt.
+        
+        Args:
+            topic: The overall topic
+            modules: Module to create a lesson for, or several for a batch
+            difficulty: Current difficulty level
+            research: Research result from the Research Agent (optional)
+            
+        Returns:
+            Tuple of the stable instructions and the per-call request
+        """
+        batch = len(modules) > 1
+        instructions = LESSONS_BATCH_INSTRUCTIONS if batch else LESSON_INSTRUCTIONS
+        
+        if batch:
+            request = "Modules:\n" + "\n".join(f"- {module}" for module in modules)
+            if not research:
+                request = f"Topic: {topic}\nDifficulty: {difficulty}\n{request}"
+        elif research:
+            request = f"Module: {modules[0]}"
+        else:
+            request = self._lesson_request(topic, modules[0], difficulty)
+        
+        if research:
+            instructions += LESSON_DOSSIER_TEMPLATE.format(
+                topic=topic,
+                difficulty=difficulty,
+                dossier=research["structured_summary"]
+            )
+        
+        return instructions, request
+    
+    def _lesson_request(self, topic: str, module_name: str, difficulty: str) -> str:
+        """Build the per-call part of the lesson prompt."""
+        return f"""Module: {module_name} (part of {topic})
+Difficulty: {difficulty}"""
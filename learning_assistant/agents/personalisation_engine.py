@@ -1,19 +1,118 @@
 """Personalisation Engine - Tracks progress and adapts difficulty."""
 
+import copy
 import os
-import json
-from typing import Dict, List
-from datetime import datetime
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property, partial
+from typing import Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Optional
 
 from learning_assistant.config import config
 from learning_assistant.tools import (
     load_user_progress,
+    read_progress_file,
+    progress_from_data,
     save_user_progress,
-    calculate_difficulty,
-    get_recommendations
+    clear_quiz_scores,
+    ensure_directory,
+    difficulty_for_average,
+    get_recommendations,
+    recommendations_from_progress,
+    update_quiz_score,
+    format_ts
 )
 
 
+@dataclass(eq=False, repr=False)
+class ProgressSummary(Mapping):
+    """
+    Progress summary (dashboard) of a user.
+    
+    The progress is loaded on first access, and recent_scores,
+    average_score and recommendation are computed from it only when
+    read, so summaries that are never looked at cost nothing. The summary
+    is also a read-only mapping of its fields, so it can be used like a
+    dictionary (summary["total_quizzes"]); use to_dict() for a plain,
+    JSON-serialisable copy.
+    """
+    user_id: str
+    load_progress: Callable[[], Dict]
+    
+    # Fields exposed through the mapping interface, in display order
+    KEYS: ClassVar[tuple] = (
+        "user_id",
+        "current_difficulty",
+        "topics_studied",
+        "total_quizzes",
+        "recent_scores",
+        "average_score",
+        "recommendation"
+    )
+    
+    @cached_property
+    def progress(self) -> Dict:
+        """The user's progress, loaded on first access."""
+        return self.load_progress()
+    
+    @property
+    def current_difficulty(self) -> str:
+        """Current difficulty level."""
+        return self.progress["current_difficulty"]
+    
+    @property
+    def topics_studied(self) -> List[str]:
+        """Topics the user has studied, in order."""
+        return self.progress["topics_studied"]
+    
+    @property
+    def total_quizzes(self) -> int:
+        """Number of quizzes taken, from the running total."""
+        return self.progress["_quiz_count"]
+    
+    @cached_property
+    def recent_scores(self) -> List[Dict]:
+        """Last five quiz score records, each with a formatted "date"."""
+        return [
+            {**score, "date": format_ts(score["ts_ms"])} for score in self.progress["quiz_scores"][-5:]
+        ]
+    
+    @cached_property
+    def _recommendations(self) -> Dict:
+        """Recommendations for the progress (see recommendations_from_progress)."""
+        return recommendations_from_progress(self.progress)
+    
+    @property
+    def average_score(self) -> float:
+        """Average quiz score percentage."""
+        return self._recommendations["average_score"]
+    
+    @property
+    def recommendation(self) -> str:
+        """Personalised suggestion text."""
+        return self._recommendations["suggestion"]
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self.KEYS
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+    
+    def __len__(self) -> int:
+        return len(self.KEYS)
+    
+    def __repr__(self) -> str:
+        return f"ProgressSummary({dict(self)!r})"
+    
+    def to_dict(self) -> Dict:
+        """Convert the summary to a JSON-serialisable dictionary."""
+        return {key: copy.deepcopy(self[key]) for key in self.KEYS}
+
+
 class PersonalisationEngine:
     """
     Personalisation Engine that tracks user progress across sessions,
@@ -28,14 +127,7 @@ class PersonalisationEngine:
             storage_path: Path to progress storage file (optional, uses config if not provided)
         """
         self.storage_path = storage_path or config.PROGRESS_FILE_PATH
-        self._ensure_storage()
-    
-    def _ensure_storage(self):
-        """Ensure storage directory and file exist."""
-        os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
-        if not os.path.exists(self.storage_path):
-            with open(self.storage_path, 'w') as f:
-                json.dump({}, f)
+        ensure_directory(os.path.dirname(self.storage_path))
     
     def load_progress(self, user_id: str = "default") -> Dict:
         """
@@ -47,9 +139,11 @@ class PersonalisationEngine:
         Returns:
             Dictionary containing user progress data:
                 - topics_studied: List of topics the user has studied
-                - quiz_scores: List of quiz score records
+                - quiz_scores: Most recent quiz score records (capped)
                 - current_difficulty: Current difficulty level
                 - total_time: Total time spent (placeholder for future use)
+                - _topics_set: Set view of topics_studied for fast membership
+                  checks (in memory only, never saved)
         """
         return load_user_progress(user_id, self.storage_path)
     
@@ -68,10 +162,12 @@ class PersonalisationEngine:
         Update user's quiz score and recalculate difficulty.
         
         This method:
-        1. Adds the new quiz score to the user's history
+        1. Appends the new quiz score to the user's history log
         2. Updates the list of topics studied
         3. Recalculates the appropriate difficulty level
-        4. Saves the updated progress
+        4. Saves the updated aggregate progress
+        
+        See tools.update_quiz_score, which does the work.
         
         Args:
             user_id: Unique identifier for the user
@@ -82,43 +178,24 @@ class PersonalisationEngine:
         Returns:
             Updated progress data dictionary
         """
-        progress = self.load_progress(user_id)
-        
-        # Add new quiz score
-        progress["quiz_scores"].append({
-            "topic": topic,
-            "score": score,
-            "total": total,
-            "percentage": (score / total) * 100,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        # Update topics studied
-        if topic not in progress["topics_studied"]:
-            progress["topics_studied"].append(topic)
-        
-        # Adapt difficulty based on performance
-        progress["current_difficulty"] = self._calculate_difficulty(progress["quiz_scores"])
-        
-        # Save updated progress
-        self.save_progress(user_id, progress)
-        
-        return progress
+        return update_quiz_score(user_id, topic, score, total, self.storage_path)
     
-    def _calculate_difficulty(self, quiz_scores: List[Dict]) -> str:
+    def _calculate_difficulty(self, avg_recent: Optional[float]) -> str:
         """
         Calculate appropriate difficulty level based on recent performance.
         
-        Uses the last N quiz scores (configured in config.RECENT_SCORES_COUNT)
-        to determine if the user should move up or down in difficulty.
+        Uses the running average of the last N quiz scores (configured in
+        config.RECENT_SCORES_COUNT), kept up to date on every insert, to
+        determine if the user should move up or down in difficulty.
         
         Args:
-            quiz_scores: List of quiz score dictionaries
+            avg_recent: Average percentage of the user's most recent quizzes,
+                or None if there are none
             
         Returns:
             Difficulty level: "beginner", "intermediate", or "advanced"
         """
-        return calculate_difficulty(quiz_scores, config.RECENT_SCORES_COUNT)
+        return difficulty_for_average(avg_recent)
     
     def get_recommendations(self, user_id: str) -> Dict:
         """
@@ -136,7 +213,7 @@ class PersonalisationEngine:
         """
         return get_recommendations(user_id, self.storage_path)
     
-    def get_progress_summary(self, user_id: str) -> Dict:
+    def get_progress_summary(self, user_id: str) -> ProgressSummary:
         """
         Get a comprehensive summary of user progress.
         
@@ -144,24 +221,33 @@ class PersonalisationEngine:
             user_id: Unique identifier for the user
             
         Returns:
-            Dictionary containing progress summary and recommendations
+            ProgressSummary with the progress summary and recommendations
         """
-        progress = self.load_progress(user_id)
-        recommendations = self.get_recommendations(user_id)
+        return self.get_dashboards([user_id])[user_id]
+    
+    def get_dashboards(self, user_ids: Iterable[str]) -> Dict[str, ProgressSummary]:
+        """
+        Get progress summaries for several users at once.
         
-        # Calculate additional statistics
-        total_quizzes = len(progress["quiz_scores"])
-        recent_scores = progress["quiz_scores"][-5:] if progress["quiz_scores"] else []
+        The progress file is read and parsed once for the whole batch
+        rather than once per user, and each user's progress is only built
+        when their summary is first read.
         
-        return {
-            "user_id": user_id,
-            "current_difficulty": progress["current_difficulty"],
-            "topics_studied": progress["topics_studied"],
-            "total_quizzes": total_quizzes,
-            "recent_scores": recent_scores,
-            "average_score": recommendations["average_score"],
-            "recommendation": recommendations["suggestion"]
-        }
+        Args:
+            user_ids: Unique identifiers of the users
+            
+        Returns:
+            Dictionary mapping each user ID to its progress summary
+        """
+        data = read_progress_file(self.storage_path)
+        
+        summaries = {}
+        for user_id in user_ids:
+            summaries[user_id] = ProgressSummary(
+                user_id, partial(progress_from_data, user_id, data, self.storage_path)
+            )
+        
+        return summaries
     
     def reset_progress(self, user_id: str):
         """
@@ -173,7 +259,13 @@ class PersonalisationEngine:
         fresh_progress = {
             "topics_studied": [],
             "quiz_scores": [],
+            "_recent_percentages": [],
+            "_avg_recent": None,
+            "_quiz_count": 0,
+            "_sum_percentage": 0.0,
+            "_log_offset": 0,
             "current_difficulty": "beginner",
             "total_time": 0
         }
+        clear_quiz_scores(user_id, self.storage_path)
         self.save_progress(user_id, fresh_progress)
@@ -1,9 +1,38 @@
 """Quiz Agent - Generates adaptive quizzes and evaluates answers."""
 
-import google.generativeai as genai
-from typing import Dict, List
+import json
+import warnings
+from typing import AsyncIterator, Dict, Iterator, List, Literal, Optional, Sequence, Tuple, Union
+from typing_extensions import TypedDict
 
-from learning_assistant.config import config
+from learning_assistant._gemini import get_model, generate, generate_async
+from learning_assistant.models import QuizQuestion
+from learning_assistant.prompts import QUIZ_INSTRUCTIONS
+
+
+class QuizOptions(TypedDict):
+    """Answer options of a multiple-choice question."""
+    A: str
+    B: str
+    C: str
+    D: str
+
+
+class QuizQuestionSchema(TypedDict):
+    """Schema of a single quiz question as returned by Gemini."""
+    question: str
+    options: QuizOptions
+    correct: Literal["A", "B", "C", "D"]
+    explanation: str
+
+
+# Ask Gemini for structured output matching the quiz schema
+QUIZ_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": list[QuizQuestionSchema]
+}
+
+_JSON_DECODER = json.JSONDecoder()
 
 
 class QuizAgent:
@@ -19,12 +48,10 @@ class QuizAgent:
         Args:
             api_key: Google Gemini API key (optional, uses config if not provided)
         """
-        api_key = api_key or config.GEMINI_API_KEY
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(config.MODEL_NAME)
+        self.model = get_model(api_key, QUIZ_INSTRUCTIONS)
     
     def generate_quiz(self, topic: str, difficulty: str = "beginner", 
-                     num_questions: int = 5) -> List[Dict]:
+                     num_questions: int = 5) -> List[QuizQuestion]:
         """
         Generate an adaptive multiple-choice quiz.
         
@@ -34,109 +61,151 @@ class QuizAgent:
             num_questions: Number of questions to generate
             
         Returns:
-            List of question dictionaries, each containing:
+            List of QuizQuestion objects, each containing:
                 - question: The question text
                 - options: Dictionary of answer options (A, B, C, D)
                 - correct: The correct answer letter
                 - explanation: Explanation of why the answer is correct
         """
-        difficulty_guidance = {
-            "beginner": "Focus on basic concepts and definitions. Questions should test fundamental understanding.",
-            "intermediate": "Include application-based questions. Test understanding of how concepts work together.",
-            "advanced": "Focus on complex scenarios, edge cases, and expert-level knowledge. Include analytical questions."
-        }
+        response = generate(
+            self.model,
+            QUIZ_INSTRUCTIONS,
+            self._quiz_request(topic, difficulty, num_questions),
+            cache=False,  # Each attempt at a topic should get new questions
+            generation_config=QUIZ_GENERATION_CONFIG
+        )
+        return self.parse_quiz(response.text)
+    
+    async def generate_quiz_async(self, topic: str, difficulty: str = "beginner",
+                                  num_questions: int = 5) -> List[QuizQuestion]:
+        """
+        Asynchronous variant of generate_quiz.
         
-        guidance = difficulty_guidance.get(difficulty, difficulty_guidance["beginner"])
+        Args:
+            topic: The topic to create quiz about
+            difficulty: Difficulty level (beginner/intermediate/advanced)
+            num_questions: Number of questions to generate
+            
+        Returns:
+            List of QuizQuestion objects (see generate_quiz)
+        """
+        response = await generate_async(
+            self.model,
+            QUIZ_INSTRUCTIONS,
+            self._quiz_request(topic, difficulty, num_questions),
+            cache=False,  # Each attempt at a topic should get new questions
+            generation_config=QUIZ_GENERATION_CONFIG
+        )
+        return self.parse_quiz(response.text)
+    
+    def generate_quiz_stream(self, topic: str, difficulty: str = "beginner",
+                             num_questions: int = 5) -> Iterator[QuizQuestion]:
+        """
+        Generate a quiz, yielding each question as soon as it is complete.
         
-        prompt = f"""Create a {difficulty} level quiz about {topic} with {num_questions} multiple choice questions.
-
-{guidance}
-
-Format each question EXACTLY as follows:
-
-Q1: [Question text]
-A) [Option A]
-B) [Option B]
-C) [Option C]
-D) [Option D]
-Correct: [A/B/C/D]
-Explanation: [Why this answer is correct and why others are wrong]
-
----
-
-Q2: [Question text]
-...
-
-Make questions progressively challenging within the {difficulty} level.
-Ensure all options are plausible to test true understanding.
-Provide clear, educational explanations."""
+        The response is streamed from Gemini and every question object is
+        decoded as soon as its closing brace arrives, so the first question
+        is usable before the whole quiz has been generated.
+        
+        Args:
+            topic: The topic to create quiz about
+            difficulty: Difficulty level (beginner/intermediate/advanced)
+            num_questions: Number of questions to generate
+            
+        Yields:
+            QuizQuestion objects (see generate_quiz)
+        """
+        stream = generate(
+            self.model,
+            QUIZ_INSTRUCTIONS,
+            self._quiz_request(topic, difficulty, num_questions),
+            generation_config=QUIZ_GENERATION_CONFIG,
+            stream=True
+        )
         
-        response = self.model.generate_content(prompt)
-        return self._parse_quiz(response.text)
+        buffer = ""
+        for chunk in stream:
+            buffer += chunk.text
+            questions, buffer = self._pop_complete_questions(buffer)
+            yield from questions
     
-    def _parse_quiz(self, quiz_text: str) -> List[Dict]:
+    async def stream_quiz(self, topic: str, difficulty: str = "beginner",
+                          num_questions: int = 5) -> AsyncIterator[str]:
         """
-        Parse quiz text into structured format.
+        Generate a quiz, yielding the raw JSON text as it is produced.
+        
+        The concatenated text can be decoded with parse_quiz.
         
         Args:
-            quiz_text: Raw quiz text from LLM
+            topic: The topic to create quiz about
+            difficulty: Difficulty level (beginner/intermediate/advanced)
+            num_questions: Number of questions to generate
+            
+        Yields:
+            Consecutive pieces of the quiz JSON text
+        """
+        stream = await generate_async(
+            self.model,
+            QUIZ_INSTRUCTIONS,
+            self._quiz_request(topic, difficulty, num_questions),
+            generation_config=QUIZ_GENERATION_CONFIG,
+            stream=True
+        )
+        async for chunk in stream:
+            yield chunk.text
+    
+    def _pop_complete_questions(self, buffer: str) -> Tuple[List[QuizQuestion], str]:
+        """
+        Decode the complete questions at the start of a partial JSON array.
+        
+        Args:
+            buffer: Streamed quiz text received so far and not yet decoded
             
         Returns:
-            List of structured question dictionaries
+            Tuple of the decoded questions and the undecoded remainder
         """
         questions = []
-        question_blocks = quiz_text.split('---')
+        pos = 0
         
-        for block in question_blocks:
-            if not block.strip():
-                continue
-            
-            lines = [l.strip() for l in block.strip().split('\n') if l.strip()]
-            if len(lines) < 6:  # Minimum: question + 4 options + correct + explanation
-                continue
+        while True:
+            # Skip the opening bracket, separators and whitespace between objects
+            while pos < len(buffer) and buffer[pos] in "[,\n\r\t ":
+                pos += 1
+            if pos >= len(buffer) or buffer[pos] != "{":
+                break
             
-            question = {
-                "question": "",
-                "options": {},
-                "correct": "",
-                "explanation": ""
-            }
-            
-            # Parse question text
-            for line in lines:
-                if line.startswith(('Q', 'Question')):
-                    # Extract question text after the number and colon
-                    if ':' in line:
-                        question["question"] = line.split(':', 1)[1].strip()
-                    else:
-                        question["question"] = line
-                    break
-            
-            # Parse options and metadata
-            for line in lines:
-                if line.startswith(('A)', 'B)', 'C)', 'D)')):
-                    key = line[0]
-                    value = line[2:].strip()
-                    question["options"][key] = value
-                elif line.startswith('Correct:'):
-                    # Extract just the letter
-                    correct_text = line.split(':')[1].strip()
-                    question["correct"] = correct_text[0].upper()
-                elif line.startswith('Explanation:'):
-                    question["explanation"] = line.split(':', 1)[1].strip()
-            
-            # Only add if we have all required components
-            if question["question"] and question["options"] and question["correct"]:
-                questions.append(question)
+            try:
+                question, pos = _JSON_DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Object not complete yet
+            questions.append(QuizQuestion.from_dict(question))
+        
+        return questions, buffer[pos:]
+    
+    def _quiz_request(self, topic: str, difficulty: str, num_questions: int) -> str:
+        """Build the per-call part of the quiz prompt."""
+        return f"""Topic: {topic}
+Difficulty Level: {difficulty}
+Number of Questions: {num_questions}"""
+    
+    def parse_quiz(self, quiz_text: str) -> List[QuizQuestion]:
+        """
+        Parse the JSON quiz returned by Gemini.
         
-        return questions
+        Args:
+            quiz_text: JSON array of questions matching QuizQuestionSchema
+            
+        Returns:
+            List of QuizQuestion objects
+        """
+        return [QuizQuestion.from_dict(question) for question in json.loads(quiz_text)]
     
-    def evaluate_answer(self, question: Dict, user_answer: str) -> Dict:
+    def evaluate_answer(self, question: QuizQuestion, user_answer: str) -> Dict:
         """
         Evaluate a user's answer to a question.
         
         Args:
-            question: Question dictionary with correct answer
+            question: Question with correct answer
             user_answer: User's selected answer (A, B, C, or D)
             
         Returns:
@@ -145,21 +214,27 @@ Provide clear, educational explanations."""
                 - explanation: Explanation from the question
                 - correct_answer: The correct answer letter
         """
-        is_correct = user_answer.upper() == question["correct"].upper()
+        is_correct = user_answer.upper() == question.correct.upper()
         
         return {
             "correct": is_correct,
-            "explanation": question.get("explanation", "No explanation available."),
-            "correct_answer": question["correct"]
+            "explanation": question.explanation,
+            "correct_answer": question.correct
         }
     
-    def evaluate_quiz(self, questions: List[Dict], user_answers: Dict[int, str]) -> Dict:
+    def evaluate_quiz(self, questions: List[QuizQuestion],
+                      user_answers: Union[Sequence[Optional[str]], Dict[int, str]],
+                      *, _stacklevel: int = 2) -> Dict:
         """
         Evaluate an entire quiz.
         
         Args:
-            questions: List of question dictionaries
-            user_answers: Dictionary mapping question index to user's answer
+            questions: List of quiz questions
+            user_answers: User's answers aligned with questions (None or a
+                missing entry counts as unanswered). A dictionary mapping
+                question index to answer is still accepted but deprecated.
+            _stacklevel: Stack level of the deprecation warning; wrappers
+                pass a higher value so it points at their own caller
             
         Returns:
             Dictionary containing:
@@ -168,24 +243,32 @@ Provide clear, educational explanations."""
                 - percentage: Score as a percentage
                 - results: List of detailed results for each question
         """
-        results = []
-        score = 0
+        if isinstance(user_answers, dict):
+            warnings.warn(
+                "Passing user_answers as a dict is deprecated; pass a list aligned with the questions",
+                DeprecationWarning,
+                stacklevel=_stacklevel
+            )
+            user_answers = [user_answers.get(i) for i in range(len(questions))]
+        answers = [answer or "" for answer in user_answers[:len(questions)]]
+        answers += [""] * (len(questions) - len(answers))
+        correct_mask = [
+            bool(answer) and answer.upper() == question.correct.upper()
+            for question, answer in zip(questions, answers)
+        ]
         
-        for i, question in enumerate(questions):
-            user_answer = user_answers.get(i, "")
-            evaluation = self.evaluate_answer(question, user_answer)
-            
-            if evaluation["correct"]:
-                score += 1
-            
-            results.append({
+        results = [
+            {
                 "question_num": i + 1,
-                "question": question["question"],
-                "user_answer": user_answer,
-                "correct_answer": evaluation["correct_answer"],
-                "is_correct": evaluation["correct"],
-                "explanation": evaluation["explanation"]
-            })
+                "question": question.question,
+                "user_answer": answer,
+                "correct_answer": question.correct,
+                "is_correct": is_correct,
+                "explanation": question.explanation
+            }
+            for i, (question, answer, is_correct) in enumerate(zip(questions, answers, correct_mask))
+        ]
+        score = sum(correct_mask)
         
         return {
             "score": score,
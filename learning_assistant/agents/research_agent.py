@@ -1,28 +1,39 @@
 """Research Agent - Fetches and summarises information from Wikipedia."""
 
-import wikipedia
-import google.generativeai as genai
-from typing import Dict
+import hashlib
+from collections import OrderedDict
 
+from typing import Dict, Optional
+
+from learning_assistant import _wiki
+from learning_assistant._gemini import get_model, generate, generate_async
 from learning_assistant.config import config
+from learning_assistant.prompts import SUMMARY_INSTRUCTIONS
+from learning_assistant.tools import load_cached_research, save_cached_research
 
 
 class ResearchAgent:
     """
     Research Agent that fetches information from Wikipedia and creates
     structured educational summaries using Gemini.
+    
+    Successful results are cached in memory (shared by all instances)
+    and on disk, so repeated topics skip both network round trips.
     """
     
-    def __init__(self, api_key: str = None):
+    # Most recently used research results, keyed by _cache_key()
+    _memory_cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+    
+    def __init__(self, api_key: str = None, cache_path: str = None):
         """
         Initialise the Research Agent.
         
         Args:
             api_key: Google Gemini API key (optional, uses config if not provided)
+            cache_path: Path to the on-disk research cache (optional, uses config if not provided)
         """
-        api_key = api_key or config.GEMINI_API_KEY
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(config.MODEL_NAME)
+        self.model = get_model(api_key, SUMMARY_INSTRUCTIONS)
+        self.cache_path = cache_path or config.RESEARCH_CACHE_PATH
     
     def fetch_topic_info(self, topic: str) -> Dict[str, str]:
         """
@@ -40,45 +51,158 @@ class ResearchAgent:
                 - raw_info: Raw Wikipedia summary
                 - structured_summary: Gemini-generated educational summary
         """
+        key = self._cache_key(topic)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
         try:
+            import wikipedia
+            
             # Tool 1: Wikipedia search
             wiki_summary = wikipedia.summary(topic, sentences=config.WIKIPEDIA_SENTENCES)
             
             # Tool 2: LLM-based structured summarisation
-            prompt = f"""Summarise this information about {topic} in a clear, educational format:
-
-{wiki_summary}
-
-Provide:
-1. Brief overview (2-3 sentences)
-2. Key concepts (3-5 bullet points)
-3. Why it's important
-
-Make it engaging and suitable for learners."""
+            response = generate(
+                self.model, SUMMARY_INSTRUCTIONS, self._summary_request(topic, wiki_summary)
+            )
+            
+        except Exception as e:
+            return self._error_result(topic, e)
+        
+        result = {
+            "raw_info": wiki_summary,
+            "structured_summary": response.text
+        }
+        self._set_cached(key, result)
+        return result
+    
+    async def fetch_topic_info_async(self, topic: str) -> Dict[str, str]:
+        """
+        Asynchronous variant of fetch_topic_info.
+        
+        Wikipedia is queried through the MediaWiki API on a pooled aiohttp
+        session and the summary is requested with Gemini's async API, so
+        this can be awaited alongside the other agents.
+        
+        Args:
+            topic: The topic to research
             
-            response = self.model.generate_content(prompt)
+        Returns:
+            Same dictionary as fetch_topic_info
+        """
+        key = self._cache_key(topic)
+        cached = self._get_cached(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            wiki_summary = await _wiki.summary(topic, sentences=config.WIKIPEDIA_SENTENCES)
+            response = await generate_async(
+                self.model, SUMMARY_INSTRUCTIONS, self._summary_request(topic, wiki_summary)
+            )
             
-            return {
-                "raw_info": wiki_summary,
-                "structured_summary": response.text
-            }
+        except Exception as e:
+            return self._error_result(topic, e)
+        
+        result = {
+            "raw_info": wiki_summary,
+            "structured_summary": response.text
+        }
+        self._set_cached(key, result)
+        return result
+    
+    def cached_topic_info(self, topic: str) -> Optional[Dict[str, str]]:
+        """
+        Get previously fetched information about a topic without fetching it.
+        
+        Args:
+            topic: The topic to look up
+            
+        Returns:
+            Same dictionary as fetch_topic_info, or None if not cached
+        """
+        return self._get_cached(self._cache_key(topic))
+    
+    def _cache_key(self, topic: str) -> str:
+        """Build the cache key for a topic under the current configuration."""
+        raw = f"{topic}:{config.MODEL_NAME}:{config.WIKIPEDIA_SENTENCES}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    
+    def _get_cached(self, key: str) -> Optional[Dict[str, str]]:
+        """
+        Look up a research result in the memory cache, then on disk.
+        
+        Args:
+            key: Cache key from _cache_key()
+            
+        Returns:
+            The cached result, or None on a miss
+        """
+        cache = self._memory_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return dict(cache[key])
+        
+        result = load_cached_research(key, self.cache_path)
+        if result is not None:
+            self._remember(key, dict(result))
+        return result
+    
+    def _set_cached(self, key: str, result: Dict[str, str]):
+        """Store a successful research result in memory and on disk."""
+        self._remember(key, result)
+        save_cached_research(key, result, self.cache_path)
+    
+    def _remember(self, key: str, result: Dict[str, str]):
+        """Add a result to the memory cache, evicting the least recently used."""
+        cache = self._memory_cache
+        cache[key] = result
+        cache.move_to_end(key)
+        while len(cache) > config.RESEARCH_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def _summary_request(self, topic: str, wiki_summary: str) -> str:
+        """Build the per-call part of the summarisation prompt."""
+        return f"""Topic: {topic}
+
+{wiki_summary}"""
+    
+    def _error_result(self, topic: str, error: Exception) -> Dict[str, str]:
+        """
+        Build the result returned when a topic cannot be researched.
+        
+        Args:
+            topic: The topic that was requested
+            error: The exception raised while researching
             
-        except wikipedia.exceptions.DisambiguationError as e:
+        Returns:
+            Dictionary with the same keys as a successful result
+        """
+        disambiguation_errors = [_wiki.DisambiguationError]
+        page_errors = [_wiki.PageError]
+        try:
+            import wikipedia
+            disambiguation_errors.append(wikipedia.exceptions.DisambiguationError)
+            page_errors.append(wikipedia.exceptions.PageError)
+        except ImportError:
+            pass
+        
+        if isinstance(error, tuple(disambiguation_errors)):
             # Handle disambiguation - suggest more specific topics
-            suggestions = ", ".join(e.options[:5])
+            suggestions = ", ".join(error.options[:5])
             return {
                 "raw_info": f"Multiple topics found for '{topic}'",
                 "structured_summary": f"Topic: {topic}\n\nPlease be more specific. Did you mean one of these?\n{suggestions}"
             }
-            
-        except wikipedia.exceptions.PageError:
+        
+        if isinstance(error, tuple(page_errors)):
             return {
                 "raw_info": f"Could not find Wikipedia page for '{topic}'",
                 "structured_summary": f"Topic: {topic}\n\nNo Wikipedia page found. Please check the spelling or try a different topic."
             }
-            
-        except Exception as e:
-            return {
-                "raw_info": f"Could not fetch Wikipedia info: {str(e)}",
-                "structured_summary": f"Topic: {topic}\n\nAn error occurred while fetching information. Please try again or choose a different topic."
-            }
+        
+        return {
+            "raw_info": f"Could not fetch Wikipedia info: {str(error)}",
+            "structured_summary": f"Topic: {topic}\n\nAn error occurred while fetching information. Please try again or choose a different topic."
+        }
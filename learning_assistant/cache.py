@@ -0,0 +1,96 @@
+"""Exact-match cache for LLM responses."""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+from typing import Optional
+
+from learning_assistant.tools import ensure_directory
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalise_prompt(prompt: str) -> str:
+    """Lowercase a prompt and collapse runs of whitespace."""
+    return _WHITESPACE.sub(" ", prompt.lower()).strip()
+
+
+class ResponseCache:
+    """
+    On-disk cache of LLM response texts with a time-to-live.
+    
+    Entries are stored in SQLite, keyed by the SHA-256 of the provider,
+    model and normalised prompt, so identical requests made within the
+    TTL are answered without calling the API.
+    """
+    
+    def __init__(self, path: str, ttl: float):
+        """
+        Initialise the cache.
+        
+        Args:
+            path: Path to the SQLite cache file
+            ttl: Seconds an entry stays valid
+        """
+        self.path = path
+        self.ttl = ttl
+        
+        ensure_directory(os.path.dirname(path))
+        with closing(sqlite3.connect(path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache "
+                "(key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+            )
+            conn.execute("DELETE FROM response_cache WHERE expires < ?", (time.time(),))
+    
+    @staticmethod
+    def key(provider: str, model: str, prompt: str) -> str:
+        """
+        Build the cache key for a request.
+        
+        Args:
+            provider: LLM provider name
+            model: Model name
+            prompt: Full prompt text, including anything that affects the output format
+            
+        Returns:
+            Hex digest identifying the request
+        """
+        raw = f"{provider}:{model}:{normalise_prompt(prompt)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from key()
+            
+        Returns:
+            The cached response text, or None if missing or expired
+        """
+        with closing(sqlite3.connect(self.path)) as conn:
+            row = conn.execute(
+                "SELECT value FROM response_cache WHERE key = ? AND expires >= ?",
+                (key, time.time())
+            ).fetchone()
+        
+        return row[0] if row else None
+    
+    def set(self, key: str, value: str):
+        """
+        Store a response.
+        
+        Args:
+            key: Cache key from key()
+            value: Response text to cache
+        """
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl)
+            )
@@ -15,9 +15,23 @@ class Config:
     # Model Configuration
     MODEL_NAME = "gemini-2.5-flash"
     
+    # Context Caching (stable prompt instructions cached server-side by Gemini).
+    # Gemini only caches prompts above a minimum token count, so this is off
+    # by default; when a cache cannot be created the full prompt is sent.
+    USE_CONTEXT_CACHE = False
+    CONTEXT_CACHE_TTL = 3600  # Seconds
+    
+    # Retries for rate-limited (429) and server-error (5xx) responses
+    RETRY_INITIAL_DELAY = 1.0  # Seconds before the first retry
+    RETRY_MAX_DELAY = 30.0  # Upper bound for the backoff between retries
+    RETRY_TIMEOUT = 120.0  # Total seconds to keep retrying
+    
     # Quiz Configuration
     DEFAULT_NUM_QUESTIONS = 5
     DEFAULT_DIFFICULTY = "beginner"
+    PREFETCH_NEXT_QUIZ = True  # Speculatively generate the next-difficulty quiz (async only)
+    LESSON_BATCH_SIZE = 4  # Lessons generated per request (bounded by the model's output limit)
+    PACKAGE_CACHE_SIZE = 32  # Learning packages kept per orchestrator for lesson generation
     
     # Difficulty Thresholds
     ADVANCED_THRESHOLD = 85  # >= 85% average score
@@ -26,10 +40,24 @@ class Config:
     # Progress Tracking
     PROGRESS_FILE_PATH = "data/progress.json"
     RECENT_SCORES_COUNT = 3  # Number of recent scores to consider for difficulty
+    QUIZ_SCORES_CAP = 50  # Quiz scores kept in memory per user (the log keeps the full history)
+    PROGRESS_FLUSH_DELAY = 1.0  # Seconds changed progress stays in memory before it is written
     
     # Wikipedia Configuration
     WIKIPEDIA_SENTENCES = 10
     
+    # Research Cache
+    RESEARCH_CACHE_PATH = "data/research_cache.sqlite3"
+    RESEARCH_CACHE_SIZE = 256  # Topics kept in memory per process
+    
+    # Response Cache (exact-match Gemini responses; streamed calls are not cached)
+    USE_RESPONSE_CACHE = True
+    RESPONSE_CACHE_PATH = "data/response_cache.sqlite3"
+    RESPONSE_CACHE_TTL = 24 * 3600  # Seconds a cached response stays valid
+    
+    # Set once validate() has succeeded
+    _validated = False
+    
     @classmethod
     def validate(cls):
         """Validate that required configuration is present."""
@@ -38,6 +66,13 @@ class Config:
                 "GEMINI_API_KEY not found. Please set it in your .env file. "
                 "Get your API key from: https://makersuite.google.com/app/apikey"
             )
+        cls._validated = True
         return True
+    
+    @classmethod
+    def ensure_validated(cls):
+        """Validate the configuration unless it has already been validated."""
+        if not cls._validated:
+            cls.validate()
 
 config = Config()
@@ -0,0 +1,126 @@
+"""Minimal dependency-graph scheduler for concurrent workflow steps."""
+
+import asyncio
+import concurrent.futures
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+
+@dataclass(slots=True)
+class Task:
+    """
+    A workflow step.
+    
+    fn is called with the results of its dependencies as keyword
+    arguments (named after the dependencies) and must return an
+    awaitable.
+    """
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+
+
+def _dependents(tasks: Dict[str, Task]) -> Dict[str, List[str]]:
+    """Map each task name to the names of the tasks that depend on it."""
+    dependents = defaultdict(list)
+    for task in tasks.values():
+        for dep in task.deps:
+            if dep not in tasks:
+                raise ValueError(f"Task '{task.name}' depends on unknown task '{dep}'")
+            dependents[dep].append(task.name)
+    return dependents
+
+
+def _check_acyclic(tasks: Dict[str, Task], dependents: Dict[str, List[str]]):
+    """Raise ValueError if the dependencies form a cycle."""
+    # Kahn's algorithm: every task is reached only if the graph is acyclic
+    in_degree = {name: len(task.deps) for name, task in tasks.items()}
+    ready = [name for name, degree in in_degree.items() if degree == 0]
+    visited = 0
+    while ready:
+        name = ready.pop()
+        visited += 1
+        for dependent in dependents[name]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                ready.append(dependent)
+    
+    if visited != len(tasks):
+        cyclic = sorted(name for name, degree in in_degree.items() if degree > 0)
+        raise ValueError(f"Dependency cycle between tasks: {', '.join(cyclic)}")
+
+
+async def run_dag(tasks: Iterable[Task]) -> Dict[str, Any]:
+    """
+    Run tasks concurrently, each as soon as all of its dependencies are done.
+    
+    If a task fails, the tasks still running are cancelled and the
+    exception is propagated.
+    
+    Args:
+        tasks: Tasks to run; names must be unique
+        
+    Returns:
+        Dictionary mapping each task name to its result
+        
+    Raises:
+        ValueError: If names are duplicated, a dependency is unknown or
+            the dependencies form a cycle
+    """
+    by_name = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"Duplicate task name '{task.name}'")
+        by_name[task.name] = task
+    dependents = _dependents(by_name)
+    _check_acyclic(by_name, dependents)
+    
+    in_degree = {name: len(task.deps) for name, task in by_name.items()}
+    
+    results = {}
+    running = {}
+    
+    def start(name: str):
+        task = by_name[name]
+        future = asyncio.ensure_future(task.fn(**{dep: results[dep] for dep in task.deps}))
+        running[future] = name
+    
+    for name, degree in in_degree.items():
+        if degree == 0:
+            start(name)
+    
+    try:
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                for dependent in dependents[name]:
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        start(dependent)
+    finally:
+        for future in running:
+            future.cancel()
+    
+    return results
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Uses asyncio.run, or a worker thread with its own event loop when the
+    caller is already running inside one (for example in a notebook).
+    Every call gets a new event loop, so the coroutine must not use
+    clients bound to a loop, such as the Gemini SDK's async gRPC client;
+    run blocking calls through asyncio.to_thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
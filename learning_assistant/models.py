@@ -0,0 +1,53 @@
+"""Data models passed between the agents and the orchestrator."""
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List
+
+
+DEFAULT_EXPLANATION = "No explanation available."
+
+
+@dataclass(slots=True)
+class QuizQuestion:
+    """A single multiple-choice quiz question."""
+    question: str
+    options: Dict[str, str]
+    correct: str
+    explanation: str = DEFAULT_EXPLANATION
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuizQuestion":
+        """
+        Build a question from its dictionary form.
+        
+        Args:
+            data: Question dictionary as returned by Gemini or to_dict
+            
+        Returns:
+            The corresponding QuizQuestion
+        """
+        return cls(
+            question=data["question"],
+            options=data["options"],
+            correct=data["correct"],
+            explanation=data.get("explanation") or DEFAULT_EXPLANATION
+        )
+    
+    def to_dict(self) -> Dict:
+        """Convert the question to a JSON-serialisable dictionary."""
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class LearningPackage:
+    """A complete learning package created by the orchestrator."""
+    topic: str
+    goal: str
+    difficulty: str
+    research: Dict[str, str]
+    learning_plan: str
+    quiz: List[QuizQuestion]
+    
+    def to_dict(self) -> Dict:
+        """Convert the package, including its quiz, to a JSON-serialisable dictionary."""
+        return asdict(self)
@@ -1,14 +1,28 @@
 """Learning Orchestrator - Coordinates all agents to create complete learning experiences."""
 
-from typing import Dict, List
+import asyncio
+import functools
+import logging
+import sys
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 
+from learning_assistant import _wiki
 from learning_assistant.agents import (
     ResearchAgent,
     ContentAgent,
     QuizAgent,
     PersonalisationEngine
 )
+from learning_assistant.agents.personalisation_engine import ProgressSummary
 from learning_assistant.config import config
+from learning_assistant.dag import Task, run_dag, run_sync
+from learning_assistant.models import LearningPackage, QuizQuestion
+from learning_assistant.tools import extract_modules, next_difficulty, recommendations_from_progress
+
+
+logger = logging.getLogger(__name__)
 
 
 class LearningOrchestrator:
@@ -16,7 +30,7 @@ class LearningOrchestrator:
     Main orchestrator that coordinates all agents to create
     complete personalised learning experiences.
     
-    This orchestrator follows a sequential workflow:
+    This orchestrator follows this workflow (steps 2-4 run concurrently):
     1. Load user progress and get current difficulty level
     2. Research Agent fetches and summarises topic information
     3. Content Agent generates personalised learning plan
@@ -25,27 +39,56 @@ class LearningOrchestrator:
     6. Personalisation Engine updates progress and adapts difficulty
     """
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, verbose: bool = True):
         """
         Initialise the Learning Orchestrator with all agents.
         
         Args:
             api_key: Google Gemini API key (optional, uses config if not provided)
+            verbose: Log progress messages (printed to stdout unless logging
+                is already configured)
         """
         api_key = api_key or config.GEMINI_API_KEY
         
-        # Validate configuration
-        config.validate()
+        self.verbose = verbose
+        if verbose and not logger.hasHandlers():
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        
+        # Validate configuration (once per process)
+        config.ensure_validated()
         
         # Initialise all agents
         self.research_agent = ResearchAgent(api_key)
         self.content_agent = ContentAgent(api_key)
         self.quiz_agent = QuizAgent(api_key)
         self.personalisation_engine = PersonalisationEngine()
+        
+        # Speculatively generated quizzes: (user_id, topic) -> (difficulty, num_questions, task)
+        self._prefetched = {}
+        
+        # Most recent learning package per (user_id, topic), used for lessons;
+        # least recently used first, bounded by config.PACKAGE_CACHE_SIZE
+        self._packages: "OrderedDict[Tuple[str, str], LearningPackage]" = OrderedDict()
+    
+    def _info(self, message, *args):
+        """Log a progress message if this orchestrator is verbose."""
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info(message, *args)
+    
+    def _remember_package(self, user_id: str, topic: str, package: LearningPackage):
+        """Keep a user's latest package for a topic, evicting the least recently used."""
+        key = (user_id, topic)
+        self._packages[key] = package
+        self._packages.move_to_end(key)
+        while len(self._packages) > config.PACKAGE_CACHE_SIZE:
+            self._packages.popitem(last=False)
     
     def create_learning_package(self, topic: str, goal: str, 
                                user_id: str = "default",
-                               num_questions: int = None) -> Dict:
+                               num_questions: int = None) -> LearningPackage:
         """
         Orchestrate the creation of a complete learning package.
         
@@ -54,6 +97,13 @@ class LearningOrchestrator:
         2. Generate a personalised learning plan
         3. Create an adaptive quiz
         
+        The three steps are independent and run concurrently in worker
+        threads, so the total latency is that of the slowest agent. They
+        use the agents' blocking methods: the SDK's async gRPC client is
+        bound to the first event loop that uses it, so it cannot be shared
+        by the short-lived loop of each call. The next quiz is not
+        prefetched because that loop ends with the call.
+        
         Args:
             topic: The topic to learn about
             goal: User's learning objective
@@ -61,7 +111,7 @@ class LearningOrchestrator:
             num_questions: Number of quiz questions (optional, uses config default)
             
         Returns:
-            Dictionary containing:
+            LearningPackage containing:
                 - topic: The topic
                 - goal: The learning goal
                 - difficulty: Current difficulty level
@@ -69,47 +119,270 @@ class LearningOrchestrator:
                 - learning_plan: Personalised learning plan
                 - quiz: List of quiz questions
         """
-        # Get user's current difficulty level
+        return run_sync(self._create_learning_package(
+            topic, goal, user_id, num_questions, prefetch=False, blocking=True
+        ))
+    
+    async def create_learning_package_async(self, topic: str, goal: str,
+                                            user_id: str = "default",
+                                            num_questions: int = None) -> LearningPackage:
+        """
+        Asynchronous variant of create_learning_package.
+        
+        Research, learning plan and quiz generation only depend on the
+        topic, goal and difficulty, so the three agents run concurrently
+        and the total latency is that of the slowest one.
+        
+        When config.PREFETCH_NEXT_QUIZ is enabled, a quiz one difficulty
+        level higher is started in the background once the package is
+        ready. If the next package for the same user and topic is created
+        at that level on the same event loop, the prefetched quiz is used
+        instead of a new request; otherwise it is cancelled.
+        
+        Args:
+            topic: The topic to learn about
+            goal: User's learning objective
+            user_id: Unique identifier for the user
+            num_questions: Number of quiz questions (optional, uses config default)
+            
+        Returns:
+            Same LearningPackage as create_learning_package
+        """
+        return await self._create_learning_package(
+            topic, goal, user_id, num_questions, prefetch=config.PREFETCH_NEXT_QUIZ
+        )
+    
+    async def acreate_learning_package_stream(self, topic: str, goal: str,
+                                              user_id: str = "default",
+                                              num_questions: int = None) -> AsyncIterator[Dict]:
+        """
+        Create a learning package, yielding progress events as they happen.
+        
+        The three agents run concurrently as in create_learning_package_async,
+        but the learning plan and quiz are streamed, so their text can be
+        shown while it is generated. Events are dictionaries with a "stage"
+        key, in the order they occur:
+            - {"stage": "plan" or "quiz", "delta": str}: next piece of text
+            - {"stage": "research", "result": Dict}: the research result
+            - {"stage": "done", "package": LearningPackage}: the final package
+        
+        The quiz is always generated afresh (prefetched quizzes are neither
+        used nor started).
+        
+        Args:
+            topic: The topic to learn about
+            goal: User's learning objective
+            user_id: Unique identifier for the user
+            num_questions: Number of quiz questions (optional, uses config default)
+            
+        Yields:
+            Progress event dictionaries
+        """
         progress = self.personalisation_engine.load_progress(user_id)
         difficulty = progress.get("current_difficulty", config.DEFAULT_DIFFICULTY)
+        num_q = num_questions or config.DEFAULT_NUM_QUESTIONS
+        
+        events: asyncio.Queue = asyncio.Queue()
+        texts: Dict[str, List[str]] = {"plan": [], "quiz": []}
+        results = {}
+        start = time.perf_counter()
+        
+        def finished(stage: str):
+            self._info({"stage": stage, "elapsed_ms": round((time.perf_counter() - start) * 1000)})
+        
+        async def research():
+            results["research"] = await self.research_agent.fetch_topic_info_async(topic)
+            finished("research")
+            events.put_nowait({"stage": "research", "result": results["research"]})
         
-        print(f"📚 Creating learning package for '{topic}'...")
-        print(f"🎯 Goal: {goal}")
-        print(f"📊 Difficulty Level: {difficulty.upper()}")
-        print()
+        async def relay(stage: str, stream: AsyncIterator[str]):
+            async for delta in stream:
+                texts[stage].append(delta)
+                events.put_nowait({"stage": stage, "delta": delta})
+            finished(stage)
         
-        # Step 1: Research
-        print("🔍 Step 1: Researching topic...")
-        research_data = self.research_agent.fetch_topic_info(topic)
-        print("✓ Research complete")
-        print()
+        async def produce(step):
+            # Each producer ends with None, or the exception that stopped it
+            try:
+                await step
+            except Exception as error:
+                events.put_nowait(error)
+            else:
+                events.put_nowait(None)
         
-        # Step 2: Generate Learning Plan
-        print(f"📝 Step 2: Generating learning plan (Difficulty: {difficulty})...")
-        learning_plan = self.content_agent.generate_learning_plan(topic, goal, difficulty)
-        print("✓ Learning plan generated")
-        print()
+        producers = [
+            asyncio.ensure_future(produce(step)) for step in (
+                research(),
+                relay("plan", self.content_agent.stream_learning_plan(topic, goal, difficulty)),
+                relay("quiz", self.quiz_agent.stream_quiz(topic, difficulty, num_q))
+            )
+        ]
+        
+        try:
+            remaining = len(producers)
+            while remaining:
+                event = await events.get()
+                if isinstance(event, Exception):
+                    raise event
+                if event is None:
+                    remaining -= 1
+                    continue
+                yield event
+        finally:
+            for producer in producers:
+                producer.cancel()
+        
+        package = LearningPackage(
+            topic=topic,
+            goal=goal,
+            difficulty=difficulty,
+            research=results["research"],
+            learning_plan="".join(texts["plan"]),
+            quiz=self.quiz_agent.parse_quiz("".join(texts["quiz"]))
+        )
+        self._remember_package(user_id, topic, package)
+        finished("done")
+        yield {"stage": "done", "package": package}
+    
+    async def _create_learning_package(self, topic: str, goal: str, user_id: str,
+                                       num_questions: Optional[int],
+                                       prefetch: bool, blocking: bool = False) -> LearningPackage:
+        """
+        Create a learning package, running the three agents concurrently.
         
-        # Step 3: Create Quiz
+        Args:
+            topic: The topic to learn about
+            goal: User's learning objective
+            user_id: Unique identifier for the user
+            num_questions: Number of quiz questions (optional, uses config default)
+            prefetch: Whether to prefetch the next-difficulty quiz afterwards
+            blocking: Run the agents' blocking methods in worker threads
+                instead of their async variants (see create_learning_package)
+            
+        Returns:
+            The created LearningPackage
+        """
+        # Get user's current difficulty level
+        progress = self.personalisation_engine.load_progress(user_id)
+        difficulty = progress.get("current_difficulty", config.DEFAULT_DIFFICULTY)
         num_q = num_questions or config.DEFAULT_NUM_QUESTIONS
-        print(f"❓ Step 3: Creating {num_q}-question quiz...")
-        quiz = self.quiz_agent.generate_quiz(topic, difficulty, num_q)
-        print(f"✓ Quiz created ({len(quiz)} questions)")
-        print()
         
-        print("✅ Learning package complete!")
-        print()
+        self._info("📚 Creating learning package for '%s'...", topic)
+        self._info("🎯 Goal: %s", goal)
+        self._info("📊 Difficulty Level: %s", difficulty.upper())
         
-        return {
-            "topic": topic,
-            "goal": goal,
-            "difficulty": difficulty,
-            "research": research_data,
-            "learning_plan": learning_plan,
-            "quiz": quiz
-        }
+        if blocking:
+            steps = (
+                lambda: asyncio.to_thread(self.research_agent.fetch_topic_info, topic),
+                lambda: asyncio.to_thread(self.content_agent.generate_learning_plan, topic, goal, difficulty),
+                lambda: asyncio.to_thread(self.quiz_agent.generate_quiz, topic, difficulty, num_q)
+            )
+        else:
+            quiz_task = self._take_prefetched_quiz(user_id, topic, difficulty, num_q)
+            if quiz_task is None:
+                quiz_task = self.quiz_agent.generate_quiz_async(topic, difficulty, num_q)
+            steps = (
+                lambda: self.research_agent.fetch_topic_info_async(topic),
+                lambda: self.content_agent.generate_learning_plan_async(topic, goal, difficulty),
+                lambda: quiz_task
+            )
+        
+        async def assemble(research, learning_plan, quiz):
+            return LearningPackage(
+                topic=topic,
+                goal=goal,
+                difficulty=difficulty,
+                research=research,
+                learning_plan=learning_plan,
+                quiz=quiz
+            )
+        
+        # Research, plan and quiz are independent; the package needs all three
+        workflow = [
+            Task("research", steps[0]),
+            Task("learning_plan", steps[1]),
+            Task("quiz", steps[2]),
+            Task("package", assemble, deps=("research", "learning_plan", "quiz"))
+        ]
+        
+        self._info("🚀 Researching topic, generating learning plan and creating %d-question quiz...", num_q)
+        package = (await run_dag(workflow))["package"]
+        self._remember_package(user_id, topic, package)
+        self._info("✓ Research complete")
+        self._info("✓ Learning plan generated")
+        self._info("✓ Quiz created (%d questions)", len(package.quiz))
+        self._info("✅ Learning package complete!")
+        
+        if prefetch:
+            self._prefetch_quiz(user_id, topic, next_difficulty(difficulty), num_q)
+        
+        return package
+    
+    async def aclose(self):
+        """
+        Release the resources held on the running event loop.
+        
+        Cancels any prefetched quiz and closes the pooled Wikipedia
+        session. Call this before the event loop is closed.
+        """
+        for _, _, task in self._prefetched.values():
+            task.cancel()
+        self._prefetched.clear()
+        await _wiki.close()
+    
+    def _prefetch_quiz(self, user_id: str, topic: str, difficulty: str, num_questions: int):
+        """
+        Start generating a quiz in the background on the running event loop.
+        
+        Args:
+            user_id: Unique identifier for the user
+            topic: Topic of the quiz
+            difficulty: Predicted difficulty of the user's next quiz
+            num_questions: Number of quiz questions
+        """
+        previous = self._prefetched.pop((user_id, topic), None)
+        if previous is not None:
+            previous[2].cancel()
+        
+        task = asyncio.create_task(
+            self.quiz_agent.generate_quiz_async(topic, difficulty, num_questions)
+        )
+        self._prefetched[(user_id, topic)] = (difficulty, num_questions, task)
+    
+    def _take_prefetched_quiz(self, user_id: str, topic: str, difficulty: str,
+                              num_questions: int) -> Optional[asyncio.Task]:
+        """
+        Claim a prefetched quiz if it matches the requested one.
+        
+        Args:
+            user_id: Unique identifier for the user
+            topic: Topic of the quiz
+            difficulty: Difficulty level of the quiz being created
+            num_questions: Number of quiz questions
+            
+        Returns:
+            The prefetch task to await, or None if there is no usable prefetch
+        """
+        entry = self._prefetched.pop((user_id, topic), None)
+        if entry is None:
+            return None
+        
+        prefetched_difficulty, prefetched_num, task = entry
+        usable = (
+            prefetched_difficulty == difficulty
+            and prefetched_num == num_questions
+            and task.get_loop() is asyncio.get_running_loop()
+            and not task.cancelled()
+            and not (task.done() and task.exception() is not None)
+        )
+        if not usable:
+            task.cancel()
+            return None
+        
+        return task
     
-    def evaluate_quiz(self, quiz_questions: List[Dict], user_answers: Dict[int, str], 
+    def evaluate_quiz(self, quiz_questions: List[QuizQuestion],
+                     user_answers: Union[Sequence[Optional[str]], Dict[int, str]],
                      topic: str, user_id: str = "default") -> Dict:
         """
         Evaluate quiz answers and update user progress.
@@ -121,8 +394,9 @@ class LearningOrchestrator:
         4. Returns detailed results with new difficulty level
         
         Args:
-            quiz_questions: List of question dictionaries
-            user_answers: Dictionary mapping question index to user's answer
+            quiz_questions: List of quiz questions
+            user_answers: User's answers aligned with quiz_questions (a
+                dictionary mapping question index to answer is deprecated)
             topic: Topic of the quiz
             user_id: Unique identifier for the user
             
@@ -135,10 +409,10 @@ class LearningOrchestrator:
                 - new_difficulty: Updated difficulty level
                 - recommendation: Personalised recommendation
         """
-        print("📊 Evaluating quiz...")
+        self._info("📊 Evaluating quiz...")
         
-        # Evaluate using Quiz Agent
-        evaluation = self.quiz_agent.evaluate_quiz(quiz_questions, user_answers)
+        # Evaluate using Quiz Agent (one more frame up for its deprecation warning)
+        evaluation = self.quiz_agent.evaluate_quiz(quiz_questions, user_answers, _stacklevel=3)
         
         # Update progress using Personalisation Engine
         updated_progress = self.personalisation_engine.update_quiz_score(
@@ -148,12 +422,12 @@ class LearningOrchestrator:
             evaluation["total"]
         )
         
-        # Get recommendations
-        recommendations = self.personalisation_engine.get_recommendations(user_id)
+        # Get recommendations from the progress just saved (no second load)
+        recommendations = recommendations_from_progress(updated_progress)
         
-        print(f"✓ Quiz evaluated: {evaluation['score']}/{evaluation['total']} ({evaluation['percentage']:.1f}%)")
-        print(f"📈 New difficulty level: {updated_progress['current_difficulty'].upper()}")
-        print()
+        self._info("✓ Quiz evaluated: %d/%d (%.1f%%)",
+                   evaluation["score"], evaluation["total"], evaluation["percentage"])
+        self._info("📈 New difficulty level: %s", updated_progress["current_difficulty"].upper())
         
         return {
             **evaluation,
@@ -161,7 +435,7 @@ class LearningOrchestrator:
             "recommendation": recommendations["suggestion"]
         }
     
-    def get_user_dashboard(self, user_id: str = "default") -> Dict:
+    def get_user_dashboard(self, user_id: str = "default") -> ProgressSummary:
         """
         Get comprehensive user progress dashboard.
         
@@ -169,19 +443,37 @@ class LearningOrchestrator:
             user_id: Unique identifier for the user
             
         Returns:
-            Dictionary containing progress summary and recommendations
+            ProgressSummary (a read-only mapping) with the progress summary
+            and recommendations
         """
         return self.personalisation_engine.get_progress_summary(user_id)
     
+    def get_user_dashboards(self, user_ids: List[str]) -> Dict[str, ProgressSummary]:
+        """
+        Get progress dashboards for several users, reading storage once.
+        
+        Args:
+            user_ids: Unique identifiers of the users
+            
+        Returns:
+            Dictionary mapping each user ID to its dashboard
+        """
+        return self.personalisation_engine.get_dashboards(user_ids)
+    
     def generate_lesson(self, topic: str, module_name: str, 
-                       user_id: str = "default") -> str:
+                       user_id: str = "default",
+                       research: Optional[Dict[str, str]] = None) -> str:
         """
         Generate a detailed lesson for a specific module.
         
+        The topic's research (from the learning package, or from the
+        research cache if not given) is used as background for the lesson.
+        
         Args:
             topic: The overall topic
             module_name: Specific module to create lesson for
             user_id: Unique identifier for the user
+            research: Research data of the learning package (optional)
             
         Returns:
             Detailed lesson content as a string
@@ -190,13 +482,116 @@ class LearningOrchestrator:
         progress = self.personalisation_engine.load_progress(user_id)
         difficulty = progress.get("current_difficulty", config.DEFAULT_DIFFICULTY)
         
-        print(f"📖 Generating lesson: {module_name}")
-        print(f"📊 Difficulty: {difficulty.upper()}")
-        print()
+        self._info("📖 Generating lesson: %s", module_name)
+        self._info("📊 Difficulty: %s", difficulty.upper())
+        
+        if research is None:
+            research = self.research_agent.cached_topic_info(topic)
         
-        lesson = self.content_agent.generate_lesson(topic, module_name, difficulty)
+        lesson = self.content_agent.generate_lesson(topic, module_name, difficulty, research)
         
-        print("✓ Lesson generated")
-        print()
+        self._info("✓ Lesson generated")
         
         return lesson
+    
+    def generate_all_lessons(self, topic: str, user_id: str = "default") -> Dict[str, str]:
+        """
+        Generate lessons for every module of the user's last learning plan.
+        
+        Lessons are generated in batches (see ContentAgent.generate_lessons)
+        instead of one request per module.
+        
+        Args:
+            topic: The topic of the learning package
+            user_id: Unique identifier for the user
+            
+        Returns:
+            Dictionary mapping each module name to its lesson
+            
+        Raises:
+            ValueError: If no learning plan with modules exists for the topic
+        """
+        package, modules, difficulty = self._lesson_modules(topic, user_id)
+        lessons = self.content_agent.generate_lessons(topic, modules, difficulty, package.research)
+        self._info("✓ %d lessons generated", len(lessons))
+        return lessons
+    
+    async def generate_all_lessons_async(self, topic: str, user_id: str = "default") -> Dict[str, str]:
+        """
+        Asynchronous variant of generate_all_lessons.
+        
+        Args:
+            topic: The topic of the learning package
+            user_id: Unique identifier for the user
+            
+        Returns:
+            Dictionary mapping each module name to its lesson
+            
+        Raises:
+            ValueError: If no learning plan with modules exists for the topic
+        """
+        package, modules, difficulty = self._lesson_modules(topic, user_id)
+        lessons = await self.content_agent.generate_lessons_async(
+            topic, modules, difficulty, package.research
+        )
+        self._info("✓ %d lessons generated", len(lessons))
+        return lessons
+    
+    def _lesson_modules(self, topic: str, user_id: str) -> Tuple[LearningPackage, List[str], str]:
+        """
+        Look up the modules to generate lessons for.
+        
+        Args:
+            topic: The topic of the learning package
+            user_id: Unique identifier for the user
+            
+        Returns:
+            Tuple of the user's last package for the topic, its module names
+            and the user's current difficulty
+            
+        Raises:
+            ValueError: If no learning plan with modules exists for the topic
+        """
+        package = self._packages.get((user_id, topic))
+        if package is not None:
+            self._packages.move_to_end((user_id, topic))
+        modules = extract_modules(package.learning_plan) if package else []
+        if not modules:
+            raise ValueError(
+                f"No learning plan with modules for '{topic}'. "
+                "Create a learning package for this topic first."
+            )
+        
+        progress = self.personalisation_engine.load_progress(user_id)
+        difficulty = progress.get("current_difficulty", config.DEFAULT_DIFFICULTY)
+        
+        self._info("📖 Generating %d lessons for '%s'", len(modules), topic)
+        self._info("📊 Difficulty: %s", difficulty.upper())
+        
+        return package, modules, difficulty
+
+
+def get_orchestrator(api_key: Optional[str] = None, verbose: bool = True) -> LearningOrchestrator:
+    """
+    Get the shared orchestrator for an API key.
+    
+    The orchestrator is built once per key and verbosity, so repeated
+    callers skip config validation and agent construction and share its
+    prefetched quizzes and learning packages. Omitting the key and
+    passing the configured one give the same orchestrator, as do keyword
+    and positional arguments.
+    
+    Args:
+        api_key: Google Gemini API key (optional, uses config if not provided)
+        verbose: Log progress messages (see LearningOrchestrator)
+        
+    Returns:
+        The LearningOrchestrator for the key and verbosity
+    """
+    return _shared_orchestrator(api_key or config.GEMINI_API_KEY, bool(verbose))
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_orchestrator(api_key: str, verbose: bool) -> LearningOrchestrator:
+    """Build the orchestrator for normalised get_orchestrator arguments."""
+    return LearningOrchestrator(api_key, verbose)
@@ -0,0 +1,116 @@
+"""Shared prompt fragments for the Personalised Learning Assistant agents.
+
+Each prompt is split into stable instructions, which are identical for
+every call of a given kind, and a short request holding the per-call
+values (topic, goal, difficulty). Keeping the instructions first and
+byte-identical lets Gemini reuse them from a context cache.
+"""
+
+from types import MappingProxyType
+
+
+# Leading text shared byte-for-byte by every content and quiz prompt, so
+# the provider can reuse the common prefix across calls.
+PROMPT_PREFIX = (
+    "You are a personalised learning assistant. "
+    "Adapt all content to the learner's difficulty level "
+    "(beginner, intermediate or advanced).\n\n"
+)
+
+# Difficulty guidance for learning plans
+DIFFICULTY_CONTEXT_PLAN = MappingProxyType({
+    "beginner": "Focus on fundamentals and basic concepts. Use simple language and provide plenty of examples.",
+    "intermediate": "Build on foundational knowledge. Include more technical details and practical applications.",
+    "advanced": "Assume strong foundational knowledge. Focus on advanced concepts, edge cases, and expert-level insights."
+})
+
+# Difficulty guidance for module lessons
+DIFFICULTY_CONTEXT_LESSON = MappingProxyType({
+    "beginner": "Use simple language, provide step-by-step explanations, and include basic examples.",
+    "intermediate": "Include technical details, practical applications, and real-world scenarios.",
+    "advanced": "Focus on complex concepts, advanced techniques, and expert-level insights."
+})
+
+# Difficulty guidance for quizzes
+DIFFICULTY_GUIDANCE_QUIZ = MappingProxyType({
+    "beginner": "Focus on basic concepts and definitions. Questions should test fundamental understanding.",
+    "intermediate": "Include application-based questions. Test understanding of how concepts work together.",
+    "advanced": "Focus on complex scenarios, edge cases, and expert-level knowledge. Include analytical questions."
+})
+
+
+def _difficulty_table(guidance) -> str:
+    """Render a difficulty guidance mapping as a bullet list."""
+    return "\n".join(f"- {level}: {text}" for level, text in guidance.items())
+
+
+SUMMARY_INSTRUCTIONS = """Summarise the information about the topic given below in a clear, educational format.
+
+Provide:
+1. Brief overview (2-3 sentences)
+2. Key concepts (3-5 bullet points)
+3. Why it's important
+
+Make it engaging and suitable for learners."""
+
+LEARNING_PLAN_INSTRUCTIONS = PROMPT_PREFIX + f"""Create a detailed learning plan for the topic, learning goal and difficulty level given below.
+
+Difficulty guidance:
+{_difficulty_table(DIFFICULTY_CONTEXT_PLAN)}
+
+Structure the plan as:
+1. Learning Objectives (3-5 specific, measurable goals)
+2. Prerequisites (if any - what should learners know before starting)
+3. Learning Path (5-7 modules with brief descriptions)
+   - Start each module on its own line with a heading of the form "Module N: <name>" (e.g. "Module 1: Variables and Types")
+   - Each module should build on the previous one
+   - Include estimated time for each module
+4. Estimated Total Time
+5. Resources & Next Steps
+
+Make it practical, engaging, and tailored to the learner's difficulty level."""
+
+LESSON_INSTRUCTIONS = PROMPT_PREFIX + f"""Create a comprehensive lesson on the module given below, at the given difficulty level.
+
+Difficulty guidance:
+{_difficulty_table(DIFFICULTY_CONTEXT_LESSON)}
+
+Include:
+1. Introduction & Context (why this module matters)
+2. Core Concepts (with clear explanations)
+   - Break down complex ideas into digestible parts
+   - Use analogies where helpful
+3. Examples (2-3 practical examples)
+   - Show real-world applications
+   - Include step-by-step walkthroughs
+4. Key Takeaways (3-5 main points to remember)
+5. Practice Suggestions (how to apply this knowledge)
+
+Make it engaging, educational, and appropriate for the learner's difficulty level."""
+
+# Several lessons in one request, returned as JSON (see content_agent.LessonSchema)
+LESSONS_BATCH_INSTRUCTIONS = LESSON_INSTRUCTIONS + """
+
+Write one such lesson for each module listed below. Return a JSON array
+with one object per module, in the order given, each with the module
+name in "module" and the full lesson text in "lesson"."""
+
+# Appended to the lesson instructions when research on the topic is available.
+# Topic, difficulty and dossier then belong to the stable prefix shared by
+# every module lesson of the topic, and each request only names the module.
+LESSON_DOSSIER_TEMPLATE = """
+
+Topic: {topic}
+Difficulty: {difficulty}
+
+Use this research dossier on the topic as background:
+{dossier}"""
+
+QUIZ_INSTRUCTIONS = PROMPT_PREFIX + f"""Create a multiple choice quiz on the topic given below, with the requested number of questions at the given difficulty level.
+
+Difficulty guidance:
+{_difficulty_table(DIFFICULTY_GUIDANCE_QUIZ)}
+
+Make questions progressively challenging within the difficulty level.
+Ensure all options are plausible to test true understanding.
+Provide clear, educational explanations of why the correct answer is right and why the others are wrong."""
@@ -1,20 +1,329 @@
 """Custom tools for the Personalised Learning Assistant."""
 
-import json
+import atexit
+import copy
 import os
-from typing import Dict, List
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing, contextmanager
 from datetime import datetime
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from learning_assistant import _json
+from learning_assistant.config import config
+from learning_assistant.models import LearningPackage
+
+
+DIFFICULTY_LEVELS = ["beginner", "intermediate", "advanced"]
+
+# "Module 3: Name" headings in a learning plan (markdown emphasis allowed)
+_MODULE_HEADING = re.compile(r"^[\s#*_>\-\d.)]*Module\s+\d+\s*[:.\-–—]\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+
+# Progress keys rebuilt on load (from the quiz score log or topics_studied), never saved
+_DERIVED_KEYS = ("quiz_scores", "_topics_set")
+
+
+# Progress files are parsed once per process and written back lazily:
+# absolute storage path -> parsed data, plus the users with unsaved changes per path
+_STORE: Dict[str, Dict] = {}
+_DIRTY: Dict[str, Set[str]] = {}
+_flush_timer: Optional[threading.Timer] = None
+
+# Most recent records of the quiz score logs read so far: absolute log path -> records
+_RECENT_SCORES: Dict[str, Deque[Dict]] = {}
+
+# Absolute paths of the directories created (or found to exist) so far by ensure_directory
+_KNOWN_DIRS: Set[str] = set()
+
+_LOCK = threading.RLock()
 
 
 def ensure_data_directory():
-    """Ensure the data directory exists."""
-    os.makedirs("data", exist_ok=True)
+    """Ensure the data directory exists (see ensure_directory)."""
+    ensure_directory("data")
+
+
+def ensure_directory(path: str):
+    """
+    Ensure a directory exists, checking each path once per process.
+    
+    Paths are remembered in absolute form, so a relative path is checked
+    again after the working directory changes.
+    
+    Args:
+        path: Directory to create if needed ("" for the working directory)
+    """
+    path = os.path.abspath(path or ".")
+    if path not in _KNOWN_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _KNOWN_DIRS.add(path)
+
+
+def quiz_scores_path(user_id: str, storage_path: str = "data/progress.json") -> str:
+    """
+    Get the path of a user's append-only quiz score log.
+    
+    Logs live in a quiz_scores/ directory next to the progress file, one
+    JSON-lines file per user.
+    
+    Args:
+        user_id: Unique identifier for the user
+        storage_path: Path to the progress storage file
+        
+    Returns:
+        Path to the user's quiz score log
+    """
+    log_dir = os.path.join(os.path.dirname(storage_path), "quiz_scores")
+    return os.path.join(log_dir, quote(user_id, safe="") + ".jsonl")
+
+
+def quiz_scores_cap() -> int:
+    """Get the number of quiz scores kept in memory per user."""
+    return max(config.RECENT_SCORES_COUNT, config.QUIZ_SCORES_CAP)
+
+
+def load_quiz_scores(user_id: str, storage_path: str = "data/progress.json",
+                     limit: Optional[int] = None) -> List[Dict]:
+    """
+    Load a user's quiz score history from their log.
+    
+    For limits up to quiz_scores_cap(), only the end of the log is read,
+    once per process; the records are then kept up to date in memory by
+    append_quiz_scores.
+    
+    Args:
+        user_id: Unique identifier for the user
+        storage_path: Path to the progress storage file
+        limit: Only return the most recent records (optional, all if not provided)
+        
+    Returns:
+        List of quiz score records, oldest first
+    """
+    log_path = os.path.abspath(quiz_scores_path(user_id, storage_path))
+    cap = quiz_scores_cap()
+    if limit is None or limit > cap:
+        return list(_read_quiz_log_tail(log_path, limit))
+    
+    with _LOCK:
+        recent = _RECENT_SCORES.get(log_path)
+        if recent is None or recent.maxlen != cap:
+            recent = _RECENT_SCORES[log_path] = _read_quiz_log_tail(log_path, cap)
+        return [dict(record) for record in (list(recent)[-limit:] if limit else [])]
+
+
+def _read_quiz_log_tail(log_path: str, limit: Optional[int]) -> Deque[Dict]:
+    """
+    Read the last records of a quiz score log.
+    
+    The file is read backwards in blocks until enough lines are found, so
+    the cost depends on limit rather than on the length of the history.
+    Lines that cannot be parsed, such as one torn by an interrupted write,
+    are skipped.
+    
+    Args:
+        log_path: Path to the quiz score log
+        limit: Number of records to read (all if None)
+        
+    Returns:
+        Ring buffer of at most limit records, oldest first
+    """
+    recent = deque(maxlen=limit)
+    if not os.path.exists(log_path):
+        return recent
+    
+    with open(log_path, 'rb') as f:
+        if limit is None:
+            data, pos = f.read(), 0
+        else:
+            pos = f.seek(0, os.SEEK_END)
+            data = b""
+            while pos > 0 and data.count(b"\n") <= limit:
+                step = min(8192, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+    
+    lines = data.split(b"\n")
+    if pos > 0:
+        lines = lines[1:]  # Starts mid-line
+    recent.extend(_migrate_timestamp(record) for record in _parse_log_lines(lines))
+    return recent
+
+
+def _parse_log_lines(lines: Iterable[bytes]) -> Iterator[Dict]:
+    """
+    Parse the lines of a quiz score log, skipping blank and torn ones.
+    
+    Args:
+        lines: Raw lines of the log
+        
+    Returns:
+        Iterator over the records that could be parsed
+    """
+    for line in lines:
+        if line.strip():
+            try:
+                yield _json.loads(line)
+            except ValueError:
+                continue
+
+
+def _migrate_timestamp(record: Dict) -> Dict:
+    """
+    Convert the timestamp of a record written by an older version to ts_ms.
+    
+    Older records carry an ISO "timestamp" string or a float "ts" in
+    seconds; the record is updated in place.
+    
+    Args:
+        record: Quiz score record
+        
+    Returns:
+        The same record
+    """
+    if "ts_ms" not in record:
+        if "ts" in record:
+            record["ts_ms"] = int(record.pop("ts") * 1000)
+        elif "timestamp" in record:
+            record["ts_ms"] = int(datetime.fromisoformat(record.pop("timestamp")).timestamp() * 1000)
+    return record
+
+
+def format_ts(ts_ms: int) -> str:
+    """
+    Format a record timestamp for display.
+    
+    Args:
+        ts_ms: Milliseconds since the epoch, as stored in quiz score records
+        
+    Returns:
+        Local date and time in ISO format, to the second
+    """
+    return datetime.fromtimestamp(ts_ms / 1000).isoformat(sep=" ", timespec="seconds")
+
+
+def _fold_quiz_log(log_path: str, offset: int = 0) -> Tuple[int, float, int]:
+    """
+    Total the quiz score records of a log from a byte offset onwards.
+    
+    A final line without a newline is still being written or was torn by
+    an interrupted write, so it is left out and the returned offset points
+    at its start; unparseable complete lines are skipped.
+    
+    Args:
+        log_path: Path to the quiz score log
+        offset: Byte offset of the first record to include (a line start)
+        
+    Returns:
+        Tuple of the number of records, the sum of their percentages and
+        the byte offset of the end of the log
+    """
+    count = 0
+    total_percentage = 0.0
+    with open(log_path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            for record in _parse_log_lines([line]):
+                count += 1
+                total_percentage += record["percentage"]
+    return count, total_percentage, offset
+
+
+def append_quiz_score(user_id: str, record: Dict, storage_path: str = "data/progress.json") -> int:
+    """
+    Append a quiz score record to the user's log.
+    
+    Args:
+        user_id: Unique identifier for the user
+        record: Quiz score record to append
+        storage_path: Path to the progress storage file
+        
+    Returns:
+        Size of the log in bytes after the append
+    """
+    return append_quiz_scores(user_id, [record], storage_path)
+
+
+def append_quiz_scores(user_id: str, records: List[Dict], storage_path: str = "data/progress.json") -> int:
+    """
+    Append several quiz score records to the user's log.
+    
+    If the log does not end with a newline, because an earlier write was
+    interrupted, one is written first so the torn line stays on its own.
+    
+    Args:
+        user_id: Unique identifier for the user
+        records: Quiz score records to append, oldest first
+        storage_path: Path to the progress storage file
+        
+    Returns:
+        Size of the log in bytes after the append
+    """
+    log_path = quiz_scores_path(user_id, storage_path)
+    ensure_directory(os.path.dirname(log_path))
+    
+    with _LOCK:
+        with open(log_path, 'a+b') as f:
+            data = b"".join(_json.dumps(record) + b"\n" for record in records)
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            size = f.tell()
+        
+        recent = _RECENT_SCORES.get(os.path.abspath(log_path))
+        if recent is not None:
+            recent.extend(dict(record) for record in records)
+    
+    return size
+
+
+def clear_quiz_scores(user_id: str, storage_path: str = "data/progress.json"):
+    """
+    Delete a user's quiz score history.
+    
+    Args:
+        user_id: Unique identifier for the user
+        storage_path: Path to the progress storage file
+    """
+    log_path = quiz_scores_path(user_id, storage_path)
+    with _LOCK:
+        _RECENT_SCORES.pop(os.path.abspath(log_path), None)
+        if os.path.exists(log_path):
+            os.remove(log_path)
 
 
 def load_user_progress(user_id: str = "default", storage_path: str = "data/progress.json") -> Dict:
     """
     Load user progress from storage.
     
+    Aggregate state comes from the progress file and quiz_scores holds the
+    most recent records of the user's append-only log (see
+    quiz_scores_cap). The running totals _quiz_count and _sum_percentage
+    cover the whole log; _log_offset records how much of it they include,
+    so only records appended after the last save are read. When there are
+    such records, for example from another process, the recent window,
+    its average and the difficulty are rebuilt from the log as well, so
+    they stay consistent with the totals. Scores and totals missing from
+    progress saved by older versions are rebuilt from the log the first
+    time it is loaded. _topics_set is a set view
+    of topics_studied for O(1) membership checks; like quiz_scores it is
+    never saved.
+    
     Args:
         user_id: Unique identifier for the user
         storage_path: Path to the progress storage file
@@ -22,44 +331,203 @@ def load_user_progress(user_id: str = "default", storage_path: str = "data/progr
     Returns:
         Dictionary containing user progress data
     """
-    ensure_data_directory()
+    return progress_from_data(user_id, read_progress_file(storage_path), storage_path)
+
+
+def read_progress_file(storage_path: str = "data/progress.json") -> Dict:
+    """
+    Get the parsed contents of a progress file.
     
-    if not os.path.exists(storage_path):
-        with open(storage_path, 'w') as f:
-            json.dump({}, f)
+    The file is read once per process and kept in memory, including
+    changes not yet flushed by save_user_progress. The returned
+    dictionary is shared and must not be modified.
     
-    with open(storage_path, 'r') as f:
-        data = json.load(f)
+    Args:
+        storage_path: Path to the progress storage file
+        
+    Returns:
+        Dictionary mapping user IDs to their stored progress
+    """
+    key = os.path.abspath(storage_path)
+    with _LOCK:
+        data = _STORE.get(key)
+        if data is None:
+            ensure_directory(os.path.dirname(key))
+            
+            with _file_lock(key):
+                if not os.path.exists(key):
+                    with open(key, 'wb') as f:
+                        f.write(_json.dumps({}))
+                
+                with open(key, 'rb') as f:
+                    data = _STORE[key] = _json.loads(f.read())
+        return data
+
+
+def progress_from_data(user_id: str, data: Dict, storage_path: str = "data/progress.json") -> Dict:
+    """
+    Build a user's progress from an already-parsed progress file.
     
-    return data.get(user_id, {
+    Args:
+        user_id: Unique identifier for the user
+        data: Parsed progress file, as returned by read_progress_file
+        storage_path: Path to the progress storage file
+        
+    Returns:
+        Dictionary containing user progress data
+    """
+    # Copy, so callers can modify progress without touching the shared store
+    progress = copy.deepcopy(data[user_id]) if user_id in data else {
         "topics_studied": [],
-        "quiz_scores": [],
         "current_difficulty": "beginner",
         "total_time": 0
-    })
+    }
+    
+    # Migrate scores saved inline by older versions
+    legacy_scores = progress.pop("quiz_scores", None)
+    if legacy_scores and not os.path.exists(quiz_scores_path(user_id, storage_path)):
+        append_quiz_scores(user_id, [_migrate_timestamp(q) for q in legacy_scores], storage_path)
+    
+    # Bring the running totals up to date with the log
+    log_path = quiz_scores_path(user_id, storage_path)
+    try:
+        log_size = os.path.getsize(log_path)
+    except FileNotFoundError:
+        log_size = 0
+    offset = progress.get("_log_offset")
+    if offset is None or offset > log_size or "_quiz_count" not in progress:
+        # Saved by an older version, or the log was replaced: total it all
+        progress["_quiz_count"], progress["_sum_percentage"], offset = 0, 0.0, 0
+    appended = 0
+    if offset < log_size:
+        appended, total_percentage, offset = _fold_quiz_log(log_path, offset)
+        progress["_quiz_count"] += appended
+        progress["_sum_percentage"] += total_percentage
+    progress["_log_offset"] = offset
+    
+    if appended:
+        # Records the totals did not cover were appended elsewhere (another
+        # process, or an older version), so the cached recent window is stale
+        with _LOCK:
+            _RECENT_SCORES.pop(os.path.abspath(log_path), None)
+    progress["quiz_scores"] = load_quiz_scores(user_id, storage_path, quiz_scores_cap())
+    progress["_topics_set"] = set(progress["topics_studied"])
+    
+    # Materialise recent percentages for records saved by older versions,
+    # or recompute them to include records appended elsewhere
+    if appended or "_recent_percentages" not in progress:
+        progress["_recent_percentages"] = [
+            q["percentage"] for q in progress["quiz_scores"][-config.RECENT_SCORES_COUNT:]
+        ]
+    if appended or "_avg_recent" not in progress:
+        recent = progress["_recent_percentages"]
+        progress["_avg_recent"] = sum(recent) / len(recent) if recent else None
+    if appended:
+        progress["current_difficulty"] = difficulty_for_average(progress["_avg_recent"])
+    
+    return progress
 
 
 def save_user_progress(user_id: str, progress_data: Dict, storage_path: str = "data/progress.json"):
     """
     Save user progress to storage.
     
+    Only aggregate state, including the running score totals, is written
+    to the progress file; quiz_scores is left out because scores are
+    recorded with append_quiz_score, and _topics_set because it is
+    rebuilt from topics_studied.
+    
+    The in-memory store is updated immediately and the file is rewritten
+    config.PROGRESS_FLUSH_DELAY seconds later, so a burst of updates costs
+    a single write. Pending changes are also flushed at interpreter exit.
+    
     Args:
         user_id: Unique identifier for the user
         progress_data: Dictionary containing progress data to save
         storage_path: Path to the progress storage file
     """
-    ensure_data_directory()
+    global _flush_timer
     
-    if not os.path.exists(storage_path):
-        data = {}
-    else:
-        with open(storage_path, 'r') as f:
-            data = json.load(f)
+    record = {k: v for k, v in progress_data.items() if k not in _DERIVED_KEYS}
+    with _LOCK:
+        read_progress_file(storage_path)[user_id] = copy.deepcopy(record)
+        _DIRTY.setdefault(os.path.abspath(storage_path), set()).add(user_id)
+        
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(config.PROGRESS_FLUSH_DELAY, flush_progress)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def flush_progress():
+    """
+    Write all progress files with unsaved changes to disk.
     
-    data[user_id] = progress_data
+    Each file is re-read and only the users changed in this process are
+    merged into it, so updates saved by other processes are kept and
+    become visible here too. The whole read-merge-write runs while holding
+    the file's sidecar lock, so concurrent flushes cannot lose each
+    other's users, and the merged data is written to a temporary file that
+    then replaces it, so readers never see a partially written file.
+    """
+    global _flush_timer
+    
+    with _LOCK:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        
+        for path, user_ids in sorted(_DIRTY.items()):
+            tmp_path = path + ".tmp"
+            with _file_lock(path):
+                try:
+                    with open(path, 'rb') as f:
+                        data = _json.loads(f.read())
+                except FileNotFoundError:
+                    data = {}
+                
+                store = _STORE[path]
+                for user_id in user_ids:
+                    data[user_id] = store[user_id]
+                
+                with open(tmp_path, 'wb') as f:
+                    f.write(_json.dumps(data, indent=True))
+                os.replace(tmp_path, path)
+            
+            store.clear()
+            store.update(data)
+        _DIRTY.clear()
+
+
+@contextmanager
+def _file_lock(path: str):
+    """
+    Hold an exclusive, cross-process lock on a file while the block runs.
     
-    with open(storage_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    The lock is taken on a sidecar "<path>.lock" file, so the file itself
+    can be replaced while it is held.
+    
+    Args:
+        path: Path of the file to lock
+    """
+    with open(path + ".lock", 'a+b') as lock_file:
+        fd = lock_file.fileno()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+atexit.register(flush_progress)
 
 
 def calculate_difficulty(quiz_scores: List[Dict], recent_count: int = 3) -> str:
@@ -73,20 +541,108 @@ def calculate_difficulty(quiz_scores: List[Dict], recent_count: int = 3) -> str:
     Returns:
         Difficulty level: "beginner", "intermediate", or "advanced"
     """
-    if not quiz_scores:
+    return difficulty_from_percentages([q["percentage"] for q in quiz_scores[-recent_count:]])
+
+
+def difficulty_from_percentages(percentages: List[float]) -> str:
+    """
+    Calculate the difficulty level from a list of recent score percentages.
+    
+    Args:
+        percentages: Recent quiz score percentages, already limited to the
+            scores that should be considered
+        
+    Returns:
+        Difficulty level: "beginner", "intermediate", or "advanced"
+    """
+    if not percentages:
         return "beginner"
     
-    recent_scores = quiz_scores[-recent_count:]
-    avg_percentage = sum(q["percentage"] for q in recent_scores) / len(recent_scores)
+    return difficulty_for_average(sum(percentages) / len(percentages))
+
+
+def difficulty_for_average(avg_percentage: Optional[float]) -> str:
+    """
+    Map an average score percentage to a difficulty level.
+    
+    Args:
+        avg_percentage: Average of the recent score percentages, or None
+            if the user has no scores yet
+        
+    Returns:
+        Difficulty level: "beginner", "intermediate", or "advanced"
+    """
+    if avg_percentage is None:
+        return "beginner"
     
-    if avg_percentage >= 85:
+    if avg_percentage >= config.ADVANCED_THRESHOLD:
         return "advanced"
-    elif avg_percentage >= 70:
+    elif avg_percentage >= config.INTERMEDIATE_THRESHOLD:
         return "intermediate"
     else:
         return "beginner"
 
 
+def record_recent_percentage(progress: Dict, percentage: float, recent_count: int = 3):
+    """
+    Add a score percentage to the progress' recent percentages.
+    
+    progress["_recent_percentages"] holds the last recent_count percentages
+    alongside quiz_scores and progress["_avg_recent"] their average, so the
+    difficulty can be recalculated without walking the score records.
+    
+    Args:
+        progress: User progress dictionary to update in place
+        percentage: Percentage of the newly recorded quiz
+        recent_count: Number of recent percentages to keep
+    """
+    recent = progress.get("_recent_percentages", [])
+    recent.append(percentage)
+    recent = recent[-recent_count:]
+    
+    progress["_recent_percentages"] = recent
+    progress["_avg_recent"] = sum(recent) / len(recent) if recent else None
+
+
+def next_difficulty(difficulty: str) -> str:
+    """
+    Get the difficulty level one step above the given one.
+    
+    Args:
+        difficulty: Current difficulty level
+        
+    Returns:
+        The next harder level, or the same level if it is already the hardest
+    """
+    if difficulty not in DIFFICULTY_LEVELS:
+        return DIFFICULTY_LEVELS[0]
+    
+    index = DIFFICULTY_LEVELS.index(difficulty)
+    return DIFFICULTY_LEVELS[min(index + 1, len(DIFFICULTY_LEVELS) - 1)]
+
+
+def add_quiz_score(progress: Dict, record: Dict, log_offset: int):
+    """
+    Add a newly logged quiz score to loaded progress.
+    
+    Keeps quiz_scores capped at quiz_scores_cap() entries and updates the
+    running totals and the recent-score average in O(1).
+    
+    Args:
+        progress: User progress data, as returned by load_user_progress
+        record: Quiz score record that was appended to the log
+        log_offset: Size of the log after the append (see append_quiz_score)
+    """
+    scores = progress["quiz_scores"]
+    scores.append(record)
+    del scores[:-quiz_scores_cap()]
+    
+    progress["_quiz_count"] += 1
+    progress["_sum_percentage"] += record["percentage"]
+    progress["_log_offset"] = log_offset
+    record_recent_percentage(progress, record["percentage"], config.RECENT_SCORES_COUNT)
+
+
 def update_quiz_score(user_id: str, topic: str, score: int, total: int, 
                       storage_path: str = "data/progress.json") -> Dict:
     """
@@ -104,19 +660,22 @@ def update_quiz_score(user_id: str, topic: str, score: int, total: int,
     """
     progress = load_user_progress(user_id, storage_path)
     
-    progress["quiz_scores"].append({
+    record = {
         "topic": topic,
         "score": score,
         "total": total,
         "percentage": (score / total) * 100,
-        "timestamp": datetime.now().isoformat()
-    })
+        "ts_ms": time.time_ns() // 1_000_000
+    }
+    log_offset = append_quiz_score(user_id, record, storage_path)
+    add_quiz_score(progress, record, log_offset)
     
-    if topic not in progress["topics_studied"]:
+    if topic not in progress["_topics_set"]:
+        progress["_topics_set"].add(topic)
         progress["topics_studied"].append(topic)
     
     # Adapt difficulty based on performance
-    progress["current_difficulty"] = calculate_difficulty(progress["quiz_scores"])
+    progress["current_difficulty"] = difficulty_for_average(progress["_avg_recent"])
     
     save_user_progress(user_id, progress, storage_path)
     return progress
@@ -133,8 +692,19 @@ def get_recommendations(user_id: str, storage_path: str = "data/progress.json")
     Returns:
         Dictionary containing recommendations
     """
-    progress = load_user_progress(user_id, storage_path)
+    return recommendations_from_progress(load_user_progress(user_id, storage_path))
+
+
+def recommendations_from_progress(progress: Dict) -> Dict:
+    """
+    Build personalised recommendations from already-loaded progress.
     
+    Args:
+        progress: User progress data, as returned by load_user_progress
+        
+    Returns:
+        Dictionary containing recommendations
+    """
     recommendations = {
         "difficulty": progress["current_difficulty"],
         "topics_completed": len(progress["topics_studied"]),
@@ -142,8 +712,8 @@ def get_recommendations(user_id: str, storage_path: str = "data/progress.json")
         "suggestion": ""
     }
     
-    if progress["quiz_scores"]:
-        avg_score = sum(q["percentage"] for q in progress["quiz_scores"]) / len(progress["quiz_scores"])
+    if progress["_quiz_count"]:
+        avg_score = progress["_sum_percentage"] / progress["_quiz_count"]
         recommendations["average_score"] = round(avg_score, 1)
         
         if avg_score >= 80:
@@ -158,18 +728,80 @@ def get_recommendations(user_id: str, storage_path: str = "data/progress.json")
     return recommendations
 
 
-def export_learning_package(package: Dict, filename: str = "learning_package.json"):
+def load_cached_research(key: str, cache_path: str = "data/research_cache.sqlite3") -> Optional[Dict]:
+    """
+    Load a cached research result.
+    
+    Args:
+        key: Cache key identifying the research request
+        cache_path: Path to the SQLite research cache
+        
+    Returns:
+        The cached result dictionary, or None if it is not cached
+    """
+    if not os.path.exists(cache_path):
+        return None
+    
+    with closing(sqlite3.connect(cache_path)) as conn, conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS research_cache (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM research_cache WHERE key = ?", (key,)).fetchone()
+    
+    return _json.loads(row[0]) if row else None
+
+
+def save_cached_research(key: str, result: Dict, cache_path: str = "data/research_cache.sqlite3"):
+    """
+    Store a research result in the cache.
+    
+    Args:
+        key: Cache key identifying the research request
+        result: Research result dictionary to store
+        cache_path: Path to the SQLite research cache
+    """
+    ensure_directory(os.path.dirname(cache_path))
+    
+    with closing(sqlite3.connect(cache_path)) as conn, conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS research_cache (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "INSERT OR REPLACE INTO research_cache (key, value) VALUES (?, ?)",
+            (key, _json.dumps(result).decode("utf-8"))
+        )
+
+
+def extract_modules(learning_plan: str) -> List[str]:
+    """
+    Extract the module names from a generated learning plan.
+    
+    Looks for "Module N: Name" headings and drops markdown emphasis and
+    trailing details such as time estimates or descriptions.
+    
+    Args:
+        learning_plan: Learning plan text from the Content Agent
+        
+    Returns:
+        Module names in plan order, without duplicates
+    """
+    modules = []
+    for match in _MODULE_HEADING.finditer(learning_plan):
+        name = re.split(r"\s+[-–—]\s+|\s*\(|\*\*", match.group(1).strip(" *_#"))[0]
+        name = name.strip(" *_#:.")
+        if name and name not in modules:
+            modules.append(name)
+    return modules
+
+
+def export_learning_package(package: LearningPackage, filename: str = "learning_package.json"):
     """
     Export a learning package to a JSON file.
     
     Args:
-        package: Learning package dictionary
+        package: Learning package to export
         filename: Output filename
     """
-    ensure_data_directory()
+    ensure_directory("data")
     filepath = os.path.join("data", filename)
     
-    with open(filepath, 'w') as f:
-        json.dump(package, f, indent=2)
+    with open(filepath, 'wb') as f:
+        f.write(_json.dumps(package.to_dict(), indent=True))
     
     return filepath
@@ -6,8 +6,8 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from learning_assistant import LearningOrchestrator
-from learning_assistant.config import config
+from learning_assistant import get_orchestrator
+from learning_assistant.models import LearningPackage, QuizQuestion
 
 
 def test_create_learning_package():
@@ -18,11 +18,8 @@ def test_create_learning_package():
     print()
     
     try:
-        # Validate config
-        config.validate()
-        
         # Create orchestrator
-        orchestrator = LearningOrchestrator()
+        orchestrator = get_orchestrator(verbose=False)
         
         # Create learning package
         topic = "Python Programming"
@@ -36,22 +33,18 @@ def test_create_learning_package():
         )
         
         # Verify package structure
-        assert "topic" in package
-        assert "goal" in package
-        assert "difficulty" in package
-        assert "research" in package
-        assert "learning_plan" in package
-        assert "quiz" in package
+        assert isinstance(package, LearningPackage)
+        assert all(isinstance(q, QuizQuestion) for q in package.quiz)
         
-        assert package["topic"] == topic
-        assert package["goal"] == goal
-        assert len(package["quiz"]) > 0
+        assert package.topic == topic
+        assert package.goal == goal
+        assert len(package.quiz) > 0
         
         print("✅ TEST PASSED: Learning package created successfully")
         print()
-        print(f"Topic: {package['topic']}")
-        print(f"Difficulty: {package['difficulty']}")
-        print(f"Quiz Questions: {len(package['quiz'])}")
+        print(f"Topic: {package.topic}")
+        print(f"Difficulty: {package.difficulty}")
+        print(f"Quiz Questions: {len(package.quiz)}")
         print()
         
         return package
@@ -69,18 +62,16 @@ def test_evaluate_quiz(package):
     print()
     
     try:
-        orchestrator = LearningOrchestrator()
+        orchestrator = get_orchestrator(verbose=False)
         
         # Simulate user answers (all correct for testing)
-        user_answers = {
-            i: q["correct"] for i, q in enumerate(package["quiz"])
-        }
+        user_answers = [q.correct for q in package.quiz]
         
         # Evaluate quiz
         results = orchestrator.evaluate_quiz(
-            quiz_questions=package["quiz"],
+            quiz_questions=package.quiz,
             user_answers=user_answers,
-            topic=package["topic"],
+            topic=package.topic,
             user_id="test_user"
         )
         
@@ -116,7 +107,7 @@ def test_user_dashboard():
     print()
     
     try:
-        orchestrator = LearningOrchestrator()
+        orchestrator = get_orchestrator(verbose=False)
         
         # Get dashboard
         dashboard = orchestrator.get_user_dashboard(user_id="test_user")
@@ -0,0 +1,46 @@
+"""Unit tests for the LLM response cache (no network needed)."""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from learning_assistant import cache
+from learning_assistant.cache import ResponseCache
+
+
+def test_key_ignores_case_and_whitespace():
+    """Test that prompts differing only in case and spacing share a key."""
+    assert ResponseCache.key("gemini", "m", "Explain  Python\n") == ResponseCache.key("gemini", "m", "explain python")
+    assert ResponseCache.key("gemini", "m", "python") != ResponseCache.key("gemini", "other", "python")
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    """Test that an entry is returned within its TTL and not after it."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    
+    response_cache = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=60)
+    key = ResponseCache.key("gemini", "m", "prompt")
+    response_cache.set(key, "answer")
+    
+    now[0] += 59
+    assert response_cache.get(key) == "answer"
+    
+    now[0] += 2
+    assert response_cache.get(key) is None
+
+
+def test_expired_entries_are_purged_on_open(tmp_path, monkeypatch):
+    """Test that opening the cache deletes entries past their TTL."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    path = str(tmp_path / "cache.sqlite3")
+    
+    ResponseCache(path, ttl=60).set("key", "answer")
+    now[0] += 61
+    ResponseCache(path, ttl=60)
+    
+    now[0] = 0  # An entry still stored would be valid again
+    assert ResponseCache(path, ttl=60).get("key") is None
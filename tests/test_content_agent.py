@@ -0,0 +1,75 @@
+"""Unit tests for batched lesson generation (no network or API key needed)."""
+
+import json
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from learning_assistant.agents import ContentAgent, content_agent
+from learning_assistant.config import Config
+
+
+class FakeModel:
+    """Model answering batched requests with a fixed text and single lessons by name."""
+    
+    def __init__(self):
+        self.batch_text = "[]"
+        self.batch_calls = 0
+    
+    def generate_content(self, request, generation_config=None, **kwargs):
+        if generation_config is not None:
+            self.batch_calls += 1
+            return SimpleNamespace(text=self.batch_text)
+        return SimpleNamespace(text=f"Single lesson for {request.splitlines()[0]}")
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    """Fake model behind every agent request, with a fresh response cache."""
+    monkeypatch.setattr(Config, "USE_RESPONSE_CACHE", True)
+    monkeypatch.setattr(Config, "USE_CONTEXT_CACHE", False)
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_PATH", str(tmp_path / "response_cache.sqlite3"))
+    model = FakeModel()
+    monkeypatch.setattr(content_agent, "get_model", lambda api_key=None, system_instruction=None: model)
+    return model
+
+
+def _batch(*pairs):
+    """Build a batched lesson response."""
+    return json.dumps([{"module": module, "lesson": lesson} for module, lesson in pairs])
+
+
+def test_complete_batch_is_cached(model):
+    """Test that a batch with every lesson is used and answered from the cache next time."""
+    model.batch_text = _batch(("Basics", "B"), ("Loops", "L"))
+    agent = ContentAgent("test-key")
+    
+    for _ in range(2):
+        assert agent.generate_lessons("Python", ["Basics", "Loops"]) == {"Basics": "B", "Loops": "L"}
+    assert model.batch_calls == 1
+
+
+def test_short_batch_falls_back_and_is_not_cached(model):
+    """Test that missing lessons are generated singly and the batch is asked for again."""
+    model.batch_text = _batch(("loops", "L"))
+    agent = ContentAgent("test-key")
+    
+    for _ in range(2):
+        lessons = agent.generate_lessons("Python", ["Basics", "Loops"])
+        assert lessons == {"Basics": "Single lesson for Module: Basics (part of Python)", "Loops": "L"}
+    assert model.batch_calls == 2
+
+
+def test_malformed_batch_is_not_cached(model):
+    """Test that an unparseable batch response falls back to single lessons."""
+    model.batch_text = '{"not": "a list"'
+    agent = ContentAgent("test-key")
+    
+    for _ in range(2):
+        assert list(agent.generate_lessons("Python", ["Basics", "Loops"])) == ["Basics", "Loops"]
+    assert model.batch_calls == 2
@@ -0,0 +1,74 @@
+"""Unit tests for the dependency-graph scheduler (no network needed)."""
+
+import asyncio
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from learning_assistant.dag import Task, run_dag
+
+
+def _value(result):
+    """Make a task function returning a fixed result."""
+    async def fn(**deps):
+        return result
+    return fn
+
+
+def test_results_are_passed_to_dependents():
+    """Test that each task receives its dependencies' results by name."""
+    async def total(a, b):
+        return a + b
+    
+    results = asyncio.run(run_dag([
+        Task("total", total, deps=("a", "b")),
+        Task("a", _value(1)),
+        Task("b", _value(2))
+    ]))
+    
+    assert results == {"a": 1, "b": 2, "total": 3}
+
+
+def test_cycle_is_rejected():
+    """Test that a dependency cycle raises before any task runs."""
+    with pytest.raises(ValueError, match="cycle"):
+        asyncio.run(run_dag([
+            Task("a", _value(1), deps=("b",)),
+            Task("b", _value(2), deps=("a",))
+        ]))
+
+
+def test_unknown_dependency_is_rejected():
+    """Test that depending on a missing task raises."""
+    with pytest.raises(ValueError, match="unknown task 'missing'"):
+        asyncio.run(run_dag([Task("a", _value(1), deps=("missing",))]))
+
+
+def test_duplicate_names_are_rejected():
+    """Test that two tasks with the same name raise."""
+    with pytest.raises(ValueError, match="Duplicate task name 'a'"):
+        asyncio.run(run_dag([Task("a", _value(1)), Task("a", _value(2))]))
+
+
+def test_failure_cancels_running_tasks():
+    """Test that a failing task cancels the others and propagates its error."""
+    cancelled = []
+    
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+    
+    async def fail():
+        raise RuntimeError("boom")
+    
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(run_dag([Task("slow", slow), Task("fail", fail)]))
+    
+    assert cancelled == ["slow"]
@@ -0,0 +1,128 @@
+"""Unit tests for the orchestrator (no network or API key needed)."""
+
+import asyncio
+import sys
+import os
+import warnings
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from learning_assistant.config import Config
+from learning_assistant.models import QuizQuestion
+from learning_assistant.orchestrator import LearningOrchestrator, _shared_orchestrator, get_orchestrator
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    """Orchestrator with a placeholder key and a fake quiz generator; no request is ever sent."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(Config, "_validated", False)
+    orchestrator = LearningOrchestrator(verbose=False)
+    
+    async def generate_quiz_async(topic, difficulty="beginner", num_questions=5):
+        await asyncio.sleep(0)
+        return [f"{topic}/{difficulty}/{num_questions}"]
+    
+    monkeypatch.setattr(orchestrator.quiz_agent, "generate_quiz_async", generate_quiz_async)
+    return orchestrator
+
+
+def test_matching_prefetch_is_taken(orchestrator):
+    """Test that a prefetched quiz is claimed once for the same difficulty and size."""
+    async def run():
+        orchestrator._prefetch_quiz("u", "Python", "intermediate", 3)
+        task = orchestrator._take_prefetched_quiz("u", "Python", "intermediate", 3)
+        assert task is not None
+        assert await task == ["Python/intermediate/3"]
+        assert orchestrator._take_prefetched_quiz("u", "Python", "intermediate", 3) is None
+    
+    asyncio.run(run())
+
+
+def test_mismatched_prefetch_is_cancelled(orchestrator):
+    """Test that a prefetch for another difficulty is discarded, not used."""
+    async def run():
+        orchestrator._prefetch_quiz("u", "Python", "advanced", 3)
+        task = orchestrator._prefetched[("u", "Python")][2]
+        
+        assert orchestrator._take_prefetched_quiz("u", "Python", "intermediate", 3) is None
+        await asyncio.sleep(0)
+        assert task.cancelled()
+    
+    asyncio.run(run())
+
+
+def test_new_prefetch_replaces_the_previous_one(orchestrator):
+    """Test that prefetching again for a user and topic cancels the earlier task."""
+    async def run():
+        orchestrator._prefetch_quiz("u", "Python", "beginner", 3)
+        first = orchestrator._prefetched[("u", "Python")][2]
+        orchestrator._prefetch_quiz("u", "Python", "intermediate", 3)
+        await asyncio.sleep(0)
+        
+        assert first.cancelled()
+        assert orchestrator._prefetched[("u", "Python")][0] == "intermediate"
+    
+    asyncio.run(run())
+
+
+def test_aclose_cancels_prefetches(orchestrator):
+    """Test that aclose cancels pending prefetches and forgets them."""
+    async def run():
+        orchestrator._prefetch_quiz("u", "Python", "beginner", 3)
+        task = orchestrator._prefetched[("u", "Python")][2]
+        await orchestrator.aclose()
+        await asyncio.sleep(0)
+        
+        assert task.cancelled()
+        assert orchestrator._prefetched == {}
+    
+    asyncio.run(run())
+
+
+def test_dict_answers_warn_once_at_the_caller(orchestrator):
+    """Test that the deprecated dict answers warn once, pointing at this file."""
+    questions = [QuizQuestion("What is 1 + 1?", {"A": "1", "B": "2"}, "B", "Basic addition.")]
+    
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = orchestrator.evaluate_quiz(questions, {0: "B"}, "Maths", "u")
+    
+    assert result["score"] == 1
+    assert [w.category for w in caught] == [DeprecationWarning]
+    assert caught[0].filename == __file__
+
+
+@pytest.fixture
+def shared(tmp_path, monkeypatch):
+    """Empty get_orchestrator cache with a configured placeholder key."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(Config, "_validated", False)
+    _shared_orchestrator.cache_clear()
+    yield
+    _shared_orchestrator.cache_clear()
+
+
+def test_get_orchestrator_normalises_arguments(shared):
+    """Test that equivalent arguments share one orchestrator."""
+    orchestrator = get_orchestrator()
+    
+    assert get_orchestrator() is orchestrator
+    assert get_orchestrator("test-key") is orchestrator
+    assert get_orchestrator(None, 1) is orchestrator
+    assert get_orchestrator(verbose=True) is orchestrator
+    assert _shared_orchestrator.cache_info().currsize == 1
+
+
+def test_get_orchestrator_separates_keys_and_verbosity(shared):
+    """Test that another key or verbosity gets its own orchestrator."""
+    orchestrator = get_orchestrator(verbose=False)
+    
+    assert get_orchestrator("other-key", verbose=False) is not orchestrator
+    assert get_orchestrator(verbose=True) is not orchestrator
+    assert get_orchestrator(verbose=0) is orchestrator
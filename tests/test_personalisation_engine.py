@@ -0,0 +1,60 @@
+"""Unit tests for progress summaries (no network or API key needed)."""
+
+import json
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from learning_assistant import tools
+from learning_assistant.agents import PersonalisationEngine
+from learning_assistant.agents.personalisation_engine import ProgressSummary
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine storing progress in a fresh directory, flushed when the test ends."""
+    yield PersonalisationEngine(str(tmp_path / "data" / "progress.json"))
+    tools.flush_progress()
+
+
+def test_summary_is_a_read_only_mapping(engine):
+    """Test that summary fields are available by key, in display order."""
+    engine.update_quiz_score("ivan", "Python", 4, 5)
+    summary = engine.get_progress_summary("ivan")
+    
+    assert list(summary) == list(ProgressSummary.KEYS)
+    assert len(summary) == len(ProgressSummary.KEYS)
+    assert summary["total_quizzes"] == 1
+    assert summary["topics_studied"] == ["Python"]
+    assert summary["recent_scores"][0]["percentage"] == 80.0
+    assert "date" in summary["recent_scores"][0]
+    assert "progress" not in summary
+    with pytest.raises(KeyError):
+        summary["progress"]
+
+
+def test_dashboards_load_progress_on_first_read(engine):
+    """Test that a user's progress is only built when their summary is read."""
+    summaries = engine.get_dashboards(["judy", "ken"])
+    
+    assert "progress" not in vars(summaries["judy"])
+    assert summaries["judy"]["total_quizzes"] == 0
+    assert "progress" in vars(summaries["judy"])
+    assert "progress" not in vars(summaries["ken"])
+
+
+def test_to_dict_is_a_json_serialisable_copy(engine):
+    """Test that to_dict returns plain data that does not share the progress."""
+    engine.update_quiz_score("leo", "Python", 2, 4)
+    summary = engine.get_progress_summary("leo")
+    
+    data = summary.to_dict()
+    assert json.loads(json.dumps(data)) == data
+    assert data == dict(summary)
+    
+    data["topics_studied"].append("Rust")
+    assert summary["topics_studied"] == ["Python"]
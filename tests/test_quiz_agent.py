@@ -0,0 +1,78 @@
+"""Unit tests for quiz parsing and evaluation (no network or API key needed)."""
+
+import json
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from learning_assistant.agents import QuizAgent
+from learning_assistant.models import QuizQuestion
+
+
+QUESTIONS = [
+    {"question": "What is 1 + 1?", "options": {"A": "1", "B": "2", "C": "3", "D": "4"},
+     "correct": "B", "explanation": "Basic addition."},
+    {"question": "Which is a list?", "options": {"A": "()", "B": "{}", "C": "[]", "D": "<>"},
+     "correct": "C", "explanation": "Lists use square brackets."}
+]
+
+
+@pytest.fixture
+def agent():
+    """Quiz agent with a placeholder key; no request is ever sent."""
+    return QuizAgent("test-key")
+
+
+def test_pop_complete_questions_keeps_partial_object(agent):
+    """Test that only fully received questions are decoded from a stream."""
+    text = json.dumps(QUESTIONS)
+    cut = text.index("{", 1 + text.index("}"))  # Start of the second question
+    
+    questions, rest = agent._pop_complete_questions(text[:cut + 10])
+    assert [q.question for q in questions] == ["What is 1 + 1?"]
+    assert rest == text[cut:cut + 10]
+    
+    questions, rest = agent._pop_complete_questions(rest + text[cut + 10:])
+    assert [q.correct for q in questions] == ["C"]
+    assert rest == "]"
+
+
+def test_pop_complete_questions_waits_for_content(agent):
+    """Test that an empty or bracket-only buffer yields nothing."""
+    assert agent._pop_complete_questions("") == ([], "")
+    assert agent._pop_complete_questions("[\n  ") == ([], "")
+
+
+def test_evaluate_quiz_with_list_answers(agent):
+    """Test scoring answers given as a list, including missing ones."""
+    questions = [QuizQuestion.from_dict(q) for q in QUESTIONS]
+    
+    result = agent.evaluate_quiz(questions, ["b"])
+    
+    assert (result["score"], result["total"], result["percentage"]) == (1, 2, 50.0)
+    assert [r["user_answer"] for r in result["results"]] == ["b", ""]
+    assert [r["is_correct"] for r in result["results"]] == [True, False]
+
+
+def test_evaluate_quiz_accepts_legacy_dict_answers(agent):
+    """Test that answers keyed by question index still score, with a warning."""
+    questions = [QuizQuestion.from_dict(q) for q in QUESTIONS]
+    
+    with pytest.warns(DeprecationWarning, match="dict is deprecated"):
+        result = agent.evaluate_quiz(questions, {1: "C"})
+    
+    assert result == agent.evaluate_quiz(questions, [None, "C"])
+    assert result["score"] == 1
+
+
+def test_legacy_dict_answers_warning_points_at_the_caller(agent):
+    """Test that the deprecation warning is attributed to the calling code."""
+    questions = [QuizQuestion.from_dict(q) for q in QUESTIONS]
+    
+    with pytest.warns(DeprecationWarning) as caught:
+        agent.evaluate_quiz(questions, {0: "B"})
+    assert caught[0].filename == __file__
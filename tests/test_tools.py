@@ -0,0 +1,201 @@
+"""Unit tests for progress storage and the quiz score log (no network needed)."""
+
+import json
+import sys
+import os
+import threading
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from learning_assistant import tools
+from learning_assistant.models import LearningPackage
+
+
+@pytest.fixture
+def storage_path(tmp_path, monkeypatch):
+    """Progress file in a fresh directory, flushed when the test ends."""
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "data" / "progress.json")
+    yield path
+    tools.flush_progress()
+
+
+def _score(topic, score, total, **extra):
+    """Build a quiz score record."""
+    return {"topic": topic, "score": score, "total": total, "percentage": score / total * 100, **extra}
+
+
+def test_legacy_inline_scores_are_migrated(storage_path):
+    """Test that scores saved inside the progress file move to the log."""
+    os.makedirs(os.path.dirname(storage_path))
+    with open(storage_path, "w") as f:
+        json.dump({"alice": {
+            "topics_studied": ["Python"],
+            "current_difficulty": "beginner",
+            "total_time": 0,
+            "quiz_scores": [
+                _score("Python", 2, 4, timestamp="2024-01-01T12:00:00"),
+                _score("Python", 4, 4, ts=1704110400.5)
+            ]
+        }}, f)
+    
+    progress = tools.load_user_progress("alice", storage_path)
+    
+    assert progress["_quiz_count"] == 2
+    assert progress["_sum_percentage"] == 150.0
+    assert progress["_log_offset"] == os.path.getsize(tools.quiz_scores_path("alice", storage_path))
+    assert [q["percentage"] for q in progress["quiz_scores"]] == [50.0, 100.0]
+    assert all("ts_ms" in q and "timestamp" not in q and "ts" not in q for q in progress["quiz_scores"])
+    assert progress["quiz_scores"][1]["ts_ms"] == 1704110400500
+
+
+def test_recent_scores_are_capped_in_memory(storage_path, monkeypatch):
+    """Test that only the last quiz_scores_cap() records are kept, and kept current."""
+    monkeypatch.setattr(tools.config, "QUIZ_SCORES_CAP", 10)
+    cap = tools.quiz_scores_cap()
+    tools.append_quiz_scores("frank", [_score("Python", 1, 2, ts_ms=i) for i in range(cap + 5)], storage_path)
+    
+    progress = tools.load_user_progress("frank", storage_path)
+    assert [q["ts_ms"] for q in progress["quiz_scores"]] == list(range(5, cap + 5))
+    
+    tools.append_quiz_score("frank", _score("Python", 2, 2, ts_ms=cap + 5), storage_path)
+    recent = tools._RECENT_SCORES[os.path.abspath(tools.quiz_scores_path("frank", storage_path))]
+    assert recent.maxlen == cap
+    assert [q["ts_ms"] for q in recent] == list(range(6, cap + 6))
+    
+    # Larger limits read past the cap from the log itself
+    assert len(tools.load_quiz_scores("frank", storage_path, cap + 100)) == cap + 6
+
+
+def test_totals_fold_only_records_after_offset(storage_path):
+    """Test that loading adds the records appended after the saved offset."""
+    tools.update_quiz_score("bob", "Python", 1, 2, storage_path)
+    offset = tools.load_user_progress("bob", storage_path)["_log_offset"]
+    
+    # Appended by another process, so the saved totals do not include it yet
+    size = tools.append_quiz_score("bob", _score("Python", 2, 2, ts_ms=0), storage_path)
+    count, total_percentage, end = tools._fold_quiz_log(tools.quiz_scores_path("bob", storage_path), offset)
+    assert (count, total_percentage, end) == (1, 100.0, size)
+    
+    progress = tools.load_user_progress("bob", storage_path)
+    assert progress["_quiz_count"] == 2
+    assert progress["_sum_percentage"] == 150.0
+    assert progress["_log_offset"] == size
+
+
+def test_recent_window_includes_other_processes_appends(storage_path):
+    """Test that records appended by another process refresh the recent window."""
+    for score in (1, 1, 1):
+        tools.update_quiz_score("mia", "Python", score, 5, storage_path)
+    assert tools.load_user_progress("mia", storage_path)["current_difficulty"] == "beginner"
+    
+    # Written straight to the log, bypassing this process's in-memory window
+    with open(tools.quiz_scores_path("mia", storage_path), "ab") as f:
+        for ts_ms in (1, 2, 3):
+            f.write(json.dumps(_score("Python", 5, 5, ts_ms=ts_ms)).encode() + b"\n")
+    
+    progress = tools.load_user_progress("mia", storage_path)
+    assert progress["_quiz_count"] == 6
+    assert [q["ts_ms"] for q in progress["quiz_scores"][-3:]] == [1, 2, 3]
+    assert progress["_recent_percentages"] == [100.0, 100.0, 100.0]
+    assert progress["_avg_recent"] == 100.0
+    assert progress["current_difficulty"] == "advanced"
+
+
+def test_torn_last_line_is_skipped(storage_path):
+    """Test that an interrupted write does not break reading or later appends."""
+    tools.update_quiz_score("carol", "Python", 1, 2, storage_path)
+    log_path = tools.quiz_scores_path("carol", storage_path)
+    with open(log_path, "ab") as f:
+        f.write(b'{"topic": "Pyth')
+    torn_at = os.path.getsize(log_path) - len(b'{"topic": "Pyth')
+    
+    assert tools._fold_quiz_log(log_path) == (1, 50.0, torn_at)
+    assert len(tools._read_quiz_log_tail(log_path, 10)) == 1
+    
+    tools.append_quiz_score("carol", _score("Python", 2, 2, ts_ms=0), storage_path)
+    count, total_percentage, _ = tools._fold_quiz_log(log_path)
+    assert (count, total_percentage) == (2, 150.0)
+
+
+def test_directories_are_recreated_after_chdir(tmp_path, monkeypatch):
+    """Test that relative data directories are checked again in a new working directory."""
+    package = LearningPackage("Python", "Learn", "beginner", {}, "Module 1: Basics", [])
+    for name in ("first", "second"):
+        os.makedirs(tmp_path / name)
+        monkeypatch.chdir(tmp_path / name)
+        
+        tools.update_quiz_score("erin", "Python", 1, 2)
+        assert os.path.exists(tools.export_learning_package(package))
+        tools.flush_progress()
+        assert os.path.exists(tmp_path / name / "data" / "progress.json")
+
+
+def test_progress_is_flushed_lazily_and_merged(storage_path, monkeypatch):
+    """Test that saves stay in memory until flushed and keep other processes' users."""
+    monkeypatch.setattr(tools.config, "PROGRESS_FLUSH_DELAY", 60)
+    progress = tools.load_user_progress("grace", storage_path)
+    progress["current_difficulty"] = "advanced"
+    tools.save_user_progress("grace", progress, storage_path)
+    
+    with open(storage_path, "rb") as f:
+        assert "grace" not in json.loads(f.read())
+    assert tools.load_user_progress("grace", storage_path)["current_difficulty"] == "advanced"
+    
+    # Saved by another process while this one still had unsaved changes
+    with open(storage_path, "w") as f:
+        json.dump({"heidi": {"topics_studied": [], "current_difficulty": "intermediate", "total_time": 0}}, f)
+    tools.flush_progress()
+    
+    with open(storage_path, "rb") as f:
+        data = json.loads(f.read())
+    assert data["grace"]["current_difficulty"] == "advanced"
+    assert data["heidi"]["current_difficulty"] == "intermediate"
+    assert "quiz_scores" not in data["grace"]
+    assert tools.load_user_progress("heidi", storage_path)["current_difficulty"] == "intermediate"
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    """Test that a second holder of a file's lock waits until the first releases it."""
+    path = str(tmp_path / "progress.json")
+    events = []
+    
+    def second_holder():
+        with tools._file_lock(path):
+            events.append("second")
+    
+    with tools._file_lock(path):
+        thread = threading.Thread(target=second_holder)
+        thread.start()
+        thread.join(0.2)
+        events.append("first released")
+    thread.join()
+    
+    assert events == ["first released", "second"]
+
+
+def test_extract_modules():
+    """Test that module names are taken from varied heading styles."""
+    plan = """## Learning Path
+### Module 1: Variables and Types (2 hours)
+**Module 2: Control Flow** - if statements and loops
+- Module 3 — Functions
+Module 2: Control Flow
+Modules overview: not a heading
+"""
+    assert tools.extract_modules(plan) == ["Variables and Types", "Control Flow", "Functions"]
+    assert tools.extract_modules("No modules here.") == []
+
+
+@pytest.mark.parametrize("logged", [1, 26, 48, 49, 50, 60])
+def test_load_quiz_scores_returns_all_records_up_to_limit(storage_path, logged):
+    """Test that a limit above the number of logged records returns all of them."""
+    tools.append_quiz_scores("dave", [_score("Python", i % 5, 5, ts_ms=i) for i in range(logged)], storage_path)
+    
+    for limit in (5, tools.quiz_scores_cap()):
+        records = tools.load_quiz_scores("dave", storage_path, limit)
+        assert [q["ts_ms"] for q in records] == list(range(max(0, logged - limit), logged))
+    assert tools.load_quiz_scores("dave", storage_path, 0) == []
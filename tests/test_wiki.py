@@ -0,0 +1,80 @@
+"""Unit tests for the asynchronous Wikipedia client (no network needed)."""
+
+import asyncio
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from learning_assistant import _wiki
+
+
+def test_one_session_per_event_loop():
+    """Test that a loop reuses its session and each loop gets its own."""
+    async def sessions():
+        first = _wiki._session()
+        second = _wiki._session()
+        await _wiki.close()
+        return first, second
+    
+    first, second = asyncio.run(sessions())
+    other, _ = asyncio.run(sessions())
+    
+    assert first is second
+    assert other is not first
+    assert first.closed and other.closed
+
+
+def test_close_forgets_the_session():
+    """Test that a new session is created after the loop's one is closed."""
+    async def run():
+        first = _wiki._session()
+        await _wiki.close()
+        second = _wiki._session()
+        await _wiki.close()
+        return first, second
+    
+    first, second = asyncio.run(run())
+    assert first is not second
+
+
+def test_sessions_of_closed_loops_are_dropped():
+    """Test that creating a session prunes the entries of loops already closed."""
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(_create_session())
+    loop.close()
+    assert loop in _wiki._sessions
+    
+    asyncio.run(_create_session())
+    assert loop not in _wiki._sessions
+
+
+async def _create_session():
+    """Create the running loop's session, closing it but leaving it registered."""
+    await _wiki._session().close()
+
+
+def test_summary_falls_back_to_the_first_search_hit(monkeypatch):
+    """Test that a title with no exact page is looked up through search."""
+    async def query(params):
+        if params.get("list") == "search":
+            return {"search": [{"title": "Python (programming language)"}]}
+        if params["titles"] == "Python (programming language)":
+            return {"pages": [{"title": params["titles"], "extract": "Python is a language."}]}
+        return {"pages": [{"missing": True}]}
+    
+    monkeypatch.setattr(_wiki, "_query", query)
+    assert asyncio.run(_wiki.summary("python programming")) == "Python is a language."
+
+
+def test_summary_raises_when_search_finds_nothing(monkeypatch):
+    """Test that PageError is raised if neither the title nor a search matches."""
+    async def query(params):
+        return {"search": []} if params.get("list") == "search" else {"pages": [{"missing": True}]}
+    
+    monkeypatch.setattr(_wiki, "_query", query)
+    with pytest.raises(_wiki.PageError):
+        asyncio.run(_wiki.summary("no such page"))